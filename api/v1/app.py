@@ -26,6 +26,6 @@ def notfound(error):
   return jsonify({"error": "Not Found"}), 404
 
 if __name__ == '__main__':
-  host = os.getenv("HBNB_API_HOST". "0.0.0.0")
+  host = os.getenv("HBNB_API_HOST", "0.0.0.0")
   port = int(os.getenv("HBNB_API_PORT", 5000))
   app.run(host=host, port=port, threaded=True)
@@ -0,0 +1,261 @@
+#!/usr/bin/python3
+"""
+Response cache backends of the API: an in-process LRU cache with a time
+to live, and a client of the same cache served on a local socket so the
+workers of one host share it, run with:
+
+    HBNB_API_CACHE_KEY=<secret> python3 -m api.v1.cache [<socket path>]
+
+The socket lives in a directory only its user can reach, and the server
+and its clients must agree on HBNB_API_CACHE_KEY, which has no default.
+
+Every entry is stored with the names of the classes it was computed
+from; invalidate() drops those of the classes just written. get()
+returns the epoch of the cache along with the value, and set() ignores
+values computed before a later invalidation of one of their classes.
+"""
+
+from collections import OrderedDict
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+import os
+from os import getenv
+import stat
+import sys
+import tempfile
+import threading
+import time
+
+# integers - entries kept, and seconds each is kept for
+SIZE = int(getenv("HBNB_API_CACHE_SIZE", "1024"))
+TTL = float(getenv("HBNB_API_CACHE_TTL", "30"))
+# string - path of the socket of the shared cache, in a private directory
+SOCKET = getenv("HBNB_API_CACHE_SOCKET") or os.path.join(
+    getenv("XDG_RUNTIME_DIR") or tempfile.gettempdir(),
+    "hbnb-{}".format(os.getuid()), "api_cache.sock")
+# bytes - key the workers and the server of the shared cache agree on, or
+# None when unset
+AUTHKEY = (getenv("HBNB_API_CACHE_KEY") or "").encode() or None
+
+
+def check_key(authkey):
+    """raises ValueError unless authkey, a shared cache key, is set"""
+    if not authkey:
+        raise ValueError("the shared cache needs HBNB_API_CACHE_KEY")
+
+
+def check_private(address):
+    """
+    raises PermissionError unless the directory of the socket at address
+    belongs to the user and is closed to everyone else
+    """
+    directory = os.path.dirname(os.path.abspath(address))
+    info = os.stat(directory)
+    if info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) & 0o077:
+        raise PermissionError(
+            "{} is open to other users than its owner".format(directory))
+
+
+class LRUCache:
+    """
+    keeps up to maxsize values for ttl seconds each, dropping the least
+    recently used first
+    """
+
+    def __init__(self, maxsize=SIZE, ttl=TTL):
+        """Instantiate an empty cache"""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # OrderedDict - key -> (expiry, names, value), least recent first
+        self.entries = OrderedDict()
+        # dictionary - class name -> keys of the entries computed from it
+        self.keys = {}
+        # integers - invalidations so far, the last one of each class and
+        # the last clear()
+        self.epoch = 0
+        self.invalidated = {}
+        self.cleared = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __drop(self, key):
+        """removes the entry of key"""
+        names = self.entries.pop(key)[1]
+        for name in names:
+            keys = self.keys.get(name)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.keys[name]
+
+    def get(self, key):
+        """returns (value, epoch), value being None when key is missing"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                self.__drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None, self.epoch
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[2], self.epoch
+
+    def set(self, key, value, names, epoch):
+        """
+        stores value under key, computed from the classes names, unless
+        one of them was invalidated since epoch, returned by get()
+        """
+        with self.lock:
+            if epoch < self.cleared or any(
+                    self.invalidated.get(name, -1) > epoch for name in names):
+                return
+            if key in self.entries:
+                self.__drop(key)
+            self.entries[key] = (time.monotonic() + self.ttl, tuple(names),
+                                 value)
+            for name in names:
+                self.keys.setdefault(name, set()).add(key)
+            while len(self.entries) > self.maxsize:
+                self.__drop(next(iter(self.entries)))
+
+    def invalidate(self, names):
+        """drops the entries computed from one of the classes names"""
+        with self.lock:
+            self.epoch += 1
+            for name in names:
+                self.invalidated[name] = self.epoch
+                for key in list(self.keys.get(name, ())):
+                    self.__drop(key)
+
+    def clear(self):
+        """drops every entry"""
+        with self.lock:
+            self.epoch += 1
+            self.cleared = self.epoch
+            self.entries.clear()
+            self.keys.clear()
+
+    def stats(self):
+        """returns the size and hit counters of the cache"""
+        with self.lock:
+            return {"size": len(self.entries), "maxsize": self.maxsize,
+                    "hits": self.hits, "misses": self.misses,
+                    "invalidations": self.epoch}
+
+
+class SocketCache:
+    """
+    the LRUCache served by a CacheServer on the socket at address; each
+    thread has its own connection, reopened once when it fails, and a
+    cache that cannot be reached is a cache that misses
+    """
+
+    def __init__(self, address=SOCKET, authkey=AUTHKEY):
+        """
+        Instantiate a client of the server at address, refusing a missing
+        authkey or a directory others can reach
+        """
+        check_key(authkey)
+        if os.path.isdir(os.path.dirname(os.path.abspath(address))):
+            check_private(address)
+        self.address = address
+        self.authkey = authkey
+        self.local = threading.local()
+
+    def __call(self, method, *args, default=None):
+        """returns what method of the served cache returns for args"""
+        for attempt in range(2):
+            try:
+                conn = getattr(self.local, "conn", None)
+                if conn is None:
+                    check_private(self.address)
+                    conn = Client(self.address, family="AF_UNIX",
+                                  authkey=self.authkey)
+                    self.local.conn = conn
+                conn.send((method, args))
+                return conn.recv()
+            except (OSError, EOFError):
+                if getattr(self.local, "conn", None) is not None:
+                    self.local.conn.close()
+                self.local.conn = None
+        return default
+
+    def get(self, key):
+        """returns (value, epoch), value being None when key is missing"""
+        return self.__call("get", key, default=(None, None))
+
+    def set(self, key, value, names, epoch):
+        """stores value under key, as LRUCache.set does"""
+        if epoch is not None:
+            self.__call("set", key, value, names, epoch)
+
+    def invalidate(self, names):
+        """drops the entries computed from one of the classes names"""
+        self.__call("invalidate", list(names))
+
+    def clear(self):
+        """drops every entry"""
+        self.__call("clear")
+
+    def stats(self):
+        """returns the statistics of the served cache"""
+        return self.__call("stats", default={})
+
+
+class CacheServer:
+    """serves an LRUCache to SocketCache clients on a local socket"""
+    # tuple - the methods of the cache clients can call
+    methods = ("get", "set", "invalidate", "clear", "stats")
+
+    def __init__(self, address=SOCKET, cache=None, authkey=AUTHKEY):
+        """
+        Instantiate a server of cache listening at address, creating its
+        directory for the user alone if missing, and refusing a missing
+        authkey or a directory others can reach
+        """
+        check_key(authkey)
+        os.makedirs(os.path.dirname(os.path.abspath(address)), mode=0o700,
+                    exist_ok=True)
+        check_private(address)
+        self.cache = LRUCache() if cache is None else cache
+        self.listener = Listener(address, family="AF_UNIX", authkey=authkey)
+
+    def serve_forever(self):
+        """answers the clients, each in a thread, until close()"""
+        while True:
+            try:
+                conn = self.listener.accept()
+            except AuthenticationError:
+                continue
+            except OSError:
+                return
+            threading.Thread(target=self.handle, args=(conn,),
+                             daemon=True).start()
+
+    def handle(self, conn):
+        """answers the calls sent on conn until it closes"""
+        with conn:
+            while True:
+                try:
+                    method, args = conn.recv()
+                except (OSError, EOFError):
+                    return
+                if method not in self.methods:
+                    conn.send(None)
+                    continue
+                conn.send(getattr(self.cache, method)(*args))
+
+    def close(self):
+        """stops listening"""
+        self.listener.close()
+
+
+if __name__ == "__main__":
+    try:
+        server = CacheServer(sys.argv[1] if len(sys.argv) > 1 else SOCKET)
+    except (ValueError, PermissionError) as error:
+        sys.exit(error)
+    server.serve_forever()
@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""
+Batch retrieval of the objects of a resource by their IDs, so that
+clients resolving many IDs make one request instead of one per ID
+"""
+
+from api.v1.views import app_views
+from api.v1.views.pagination import MAX_LIMIT
+from flask import abort, jsonify, request
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+# dictionary - the class of the objects of each resource of the API
+resources = {"amenities": Amenity, "cities": City, "places": Place,
+             "reviews": Review, "states": State, "users": User}
+
+
+def batch_ids():
+    """
+    returns the IDs of the request: the "ids" list of its JSON body, or
+    its comma-separated ids argument
+    """
+    if request.method == 'POST':
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            abort(400, description="Not a JSON")
+        if "ids" not in data:
+            abort(400, description="Missing ids")
+        ids = data["ids"]
+        if (not isinstance(ids, list) or
+                not all(isinstance(id, str) for id in ids)):
+            abort(400, description="ids must be a list of strings")
+    else:
+        if "ids" not in request.args:
+            abort(400, description="Missing ids")
+        ids = [id for id in request.args["ids"].split(",") if id]
+    if len(ids) > MAX_LIMIT:
+        abort(400, description="At most {} ids".format(MAX_LIMIT))
+    return ids
+
+
+def batch_get(resource):
+    """
+    Retrieves the objects of a resource whose IDs are given, with a
+    single storage lookup (see batch_ids and storage.get_many).
+
+    Args:
+        resource (str): The resource of the objects, such as "places".
+
+    Returns:
+        JSON: The list of the objects found, in the order of the IDs and
+            once each, or a 400 Bad Request response if the IDs are
+            missing, invalid or too many.
+    """
+    ids = batch_ids()
+    return jsonify([obj.to_dict()
+                    for obj in storage.get_many(resources[resource], ids)])
+
+
+# one static rule per resource, as /<resource>/batch_get would lose to
+# rules such as /states/<state_id>
+for resource in resources:
+    app_views.add_url_rule('/{}/batch_get'.format(resource),
+                           view_func=batch_get, methods=['GET', 'POST'],
+                           strict_slashes=False,
+                           defaults={"resource": resource})
@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+"""
+Response cache of the read endpoints, whose backend HBNB_API_CACHE
+chooses: "memory" for an LRUCache of this process (the default),
+"socket" for the one shared on HBNB_API_CACHE_SOCKET with the key
+HBNB_API_CACHE_KEY (see api/v1/cache.py) or "none"; the entries of a
+class are dropped when storage writes it, and bodies over
+HBNB_API_CACHE_MAX_BODY bytes are not cached
+"""
+
+from api.v1.cache import LRUCache, SocketCache
+from api.v1.views.pagination import wants_ndjson
+from flask import Response, g, make_response, request
+from functools import wraps
+from models import storage
+from os import getenv
+
+# dictionary - the backend each HBNB_API_CACHE value makes
+backends = {"memory": LRUCache, "socket": SocketCache, "none": lambda: None}
+# the cache of the responses, or None; any object with the methods of
+# LRUCache can be plugged in instead
+backend = backends[getenv("HBNB_API_CACHE", "memory")]()
+# integer - bytes of the largest body cached
+MAX_BODY = int(getenv("HBNB_API_CACHE_MAX_BODY", str(1024 * 1024)))
+
+
+@storage.on_write
+def invalidate(names):
+    """drops the cached responses computed from the classes names"""
+    if backend is not None:
+        backend.invalidate(names)
+
+
+def tee(body, store):
+    """
+    yields the chunks of body, the iterable of a streamed response, as
+    bytes, passing them all joined to store once the last one is sent,
+    unless they add up to more than MAX_BODY bytes or the client went
+    away before
+    """
+    parts = []
+    size = 0
+    try:
+        for chunk in body:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            yield chunk
+            if parts is not None:
+                size += len(chunk)
+                if size <= MAX_BODY:
+                    parts.append(chunk)
+                else:
+                    parts = None
+    finally:
+        if hasattr(body, "close"):
+            body.close()
+    if parts is not None:
+        store(b"".join(parts))
+
+
+def cached(*classes):
+    """
+    decorates a view whose response only depends on its URL, its format
+    and the objects of classes (classes or class names), so that it only
+    runs when the cache has no response for them; under conditional(),
+    entries only answer requests with the entity tag they were made for,
+    so a body computed before a write no other process reported to this
+    cache is never served under the tag of a later version
+    """
+    names = tuple(cls if isinstance(cls, str) else cls.__name__
+                  for cls in classes)
+
+    def decorator(view):
+        """returns view answering from the cache"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            """returns the cached response, or caches that of view"""
+            cache = backend
+            if cache is None:
+                return view(*args, **kwargs)
+            key = (request.full_path, wants_ndjson())
+            etag = g.get("etag")
+            value, epoch = cache.get(key)
+            if value is not None and value[3] == etag:
+                status, headers, body = value[:3]
+                return Response(body, status=status, headers=headers)
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            headers = list(response.headers.items())
+
+            def store(body):
+                """caches body as the response of the request"""
+                cache.set(key, (200, headers, body, etag), names, epoch)
+            if response.is_streamed:
+                response.response = tee(response.response, store)
+            elif len(response.get_data()) <= MAX_BODY:
+                store(response.get_data())
+            return response
+        return wrapper
+    return decorator
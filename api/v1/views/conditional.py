@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""
+Conditional GET of the API: entity tags and Last-Modified dates checked
+against If-None-Match and If-Modified-Since before any serialization
+"""
+
+from api.v1.views.pagination import wants_ndjson
+from datetime import timezone
+from flask import Response, g, jsonify, make_response, request
+from functools import wraps
+import hashlib
+from models import storage
+
+
+def make_etag(*parts):
+    """returns the strong entity tag of the representation named by parts"""
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def tag(response, etag, modified=None):
+    """sets the validators etag and modified on response and returns it"""
+    response.set_etag(etag)
+    if modified is not None:
+        response.last_modified = modified.replace(tzinfo=timezone.utc)
+    response.vary.add("Accept")
+    return response
+
+
+def not_modified(etag, modified=None):
+    """
+    returns a 304 Not Modified response when the request already has the
+    representation tagged etag, last modified at modified, or None;
+    If-Modified-Since only counts without If-None-Match (RFC 7232)
+    """
+    if request.if_none_match:
+        if not request.if_none_match.contains_weak(etag):
+            return None
+    elif request.if_modified_since is None or modified is None:
+        return None
+    elif (modified.replace(tzinfo=timezone.utc, microsecond=0) >
+          request.if_modified_since):
+        return None
+    return tag(Response(status=304), etag, modified)
+
+
+def conditional(cls):
+    """
+    decorates a view listing the objects of class cls so that it answers
+    304 Not Modified, without running, while storage.version(cls) and
+    the URL and format asked for are those the client has; the entity tag
+    is left in g.etag for cached() to check its entries against
+    """
+    def decorator(view):
+        """returns view answering conditional requests"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            """runs view unless the client has its response already"""
+            version, modified = storage.version(cls)
+            etag = make_etag(version, request.full_path, wants_ndjson())
+            g.etag = etag
+            response = not_modified(etag, modified)
+            if response is not None:
+                return response
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                tag(response, etag, modified)
+            return response
+        return wrapper
+    return decorator
+
+
+def object_response(obj):
+    """
+    returns the JSON of obj tagged with its class, id and updated_at and
+    the version of its class, as updated_at may only keep whole seconds,
+    or 304 Not Modified if the request already has it
+    """
+    modified = obj.updated_at
+    version = storage.version(type(obj))[0]
+    etag = make_etag(obj.__class__.__name__, obj.id, modified.isoformat(),
+                     version)
+    response = not_modified(etag, modified)
+    if response is None:
+        response = tag(jsonify(obj.to_dict()), etag, modified)
+    return response
@@ -2,6 +2,7 @@
 """index file"""
 
 from api.v1.views import app_views
+from api.v1.views import caching
 from flask import jsonify
 from models import storage
 
@@ -10,13 +11,19 @@ def get_status():
     return jsonify({"status": "OK"})
 
 @app_views.route('/stats', methods=['GET'])
+@caching.cached("Amenity", "City", "Place", "Review", "State", "User")
 def get_stats():
-    stats = {
-        "Amenity": storage.count("Amenity"),
-        "City": storage.count("City"),
-        "Place": storage.count("Place"),
-        "Review": storage.count("Review"),
-        "State": storage.count("State"),
-        "User": storage.count("User")
-    }
+    stats = storage.count_many(["Amenity", "City", "Place", "Review",
+                                "State", "User"])
     return jsonify(stats)
+
+@app_views.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    returns the counters of the storage engine, such as its pool, and
+    those of the response cache
+    """
+    metrics = storage.metrics()
+    if caching.backend is not None:
+        metrics["cache"] = caching.backend.stats()
+    return jsonify(metrics)
@@ -0,0 +1,133 @@
+#!/usr/bin/python3
+"""
+Keyset pagination and streaming of the list endpoints
+"""
+
+import base64
+from flask import (Response, abort, jsonify, request, stream_with_context,
+                   url_for)
+from models import storage
+from models.base_model import parse_time
+from os import getenv
+
+# integers - page size when only a cursor is given, and the largest one
+DEFAULT_LIMIT = 100
+MAX_LIMIT = int(getenv("HBNB_API_MAX_LIMIT", "1000"))
+# boolean - whether unpaged lists are streamed instead of built in memory
+STREAM = getenv("HBNB_API_STREAM", "1") == "1"
+# integer - bytes of a streamed JSON array buffered before sending a chunk
+CHUNK_SIZE = 64 * 1024
+# string - media type of newline-delimited JSON, one object per line
+NDJSON = "application/x-ndjson"
+
+
+def encode_cursor(obj):
+    """returns the cursor of the page starting right after obj"""
+    text = obj.created_at.isoformat() + " " + obj.id
+    return base64.urlsafe_b64encode(text.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    returns the (created_at, id) pair a cursor points after; times with
+    an offset are invalid, as they do not compare with those of objects
+    """
+    try:
+        text = base64.urlsafe_b64decode(
+            cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, id = text.split(" ", 1)
+        return parse_time(created_at), id
+    except ValueError:
+        abort(400, description="Invalid cursor")
+
+
+def page_args():
+    """
+    returns the (after, limit) of the limit and cursor arguments of the
+    request, or None when it has neither
+    """
+    if "limit" not in request.args and "cursor" not in request.args:
+        return None
+    try:
+        limit = int(request.args.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        limit = 0
+    if not 0 < limit <= MAX_LIMIT:
+        abort(400, description="limit must be between 1 and {}".format(
+            MAX_LIMIT))
+    cursor = request.args.get("cursor")
+    return (decode_cursor(cursor) if cursor else None), limit
+
+
+def wants_ndjson():
+    """returns True if the request prefers NDJSON to a JSON array"""
+    best = request.accept_mimetypes.best_match(["application/json", NDJSON])
+    return best == NDJSON
+
+
+def ndjson_lines(objs):
+    """yields one line of JSON per object of objs"""
+    for obj in objs:
+        yield obj.to_json_string() + "\n"
+
+
+def json_chunks(objs):
+    """
+    yields the JSON array of the objects of objs in chunks of about
+    CHUNK_SIZE bytes, so only one chunk is ever held in memory
+    """
+    parts = ["["]
+    size = 1
+    for obj in objs:
+        text = obj.to_json_string()
+        if len(parts) > 1:
+            text = "," + text
+        parts.append(text)
+        size += len(text)
+        if size >= CHUNK_SIZE:
+            yield "".join(parts)
+            parts = [""]
+            size = 0
+    parts.append("]")
+    yield "".join(parts)
+
+
+def stream(objs):
+    """
+    returns a response streaming the objects of objs as NDJSON when the
+    request asks for it, or as a JSON array; the request context, and
+    with it the storage session, lives until the last object is sent
+    """
+    if wants_ndjson():
+        return Response(stream_with_context(ndjson_lines(objs)),
+                        mimetype=NDJSON)
+    return Response(stream_with_context(json_chunks(objs)),
+                    mimetype="application/json")
+
+
+def paginate(cls, **where):
+    """
+    returns the JSON list of the objects of class cls whose attributes
+    equal where: all of them, or one page ordered by (created_at, id)
+    when the request has a limit or cursor argument, with a Link header
+    to the next page if there is one; unpaged lists are streamed from
+    storage.iter unless HBNB_API_STREAM is 0, and either is sent as
+    NDJSON when the request accepts it
+    """
+    args = page_args()
+    if args is None:
+        if STREAM or wants_ndjson():
+            return stream(storage.iter(cls, where=where))
+        return jsonify([obj.to_dict() for obj in storage.find(cls, **where)])
+    after, limit = args
+    objs = storage.page(cls, after=after, limit=limit + 1, where=where)
+    if wants_ndjson():
+        response = Response(ndjson_lines(objs[:limit]), mimetype=NDJSON)
+    else:
+        response = jsonify([obj.to_dict() for obj in objs[:limit]])
+    if len(objs) > limit:
+        url = url_for(request.endpoint, _external=True, limit=limit,
+                      cursor=encode_cursor(objs[limit - 1]),
+                      **request.view_args)
+        response.headers["Link"] = '<{}>; rel="next"'.format(url)
+    return response
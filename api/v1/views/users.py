@@ -2,24 +2,48 @@
 """
 User object that handles all default RESTFul API actions.
 
-This module provides functions for retrieving, creating, and deleting User objects.
+This module provides functions for retrieving, creating, and deleting User
+objects.
 """
 
 from flask import jsonify, request, abort
 from api.v1.views import app_views
+from api.v1.views.conditional import conditional, object_response
+from api.v1.views.pagination import paginate
 from models import storage
 from models.user import User
 
+
 @app_views.route('/users', methods=['GET'], strict_slashes=False)
+@conditional(User)
 def get_users():
     """
-    Retrieves all User objects.
+    Retrieves all User objects, or one page of them (see paginate),
+    unless the client has them already (see conditional).
 
     Returns:
-        JSON: A list of dictionaries representing all User objects.
+        JSON: A list of dictionaries representing the User objects.
+    """
+    return paginate(User)
+
+
+@app_views.route('/users/<user_id>', methods=['GET'], strict_slashes=False)
+def get_user(user_id):
     """
-  users = storage.all(User).values()
-  return jsonify([user.to_dict() for user in users])
+    Retrieves a specific User object.
+
+    Args:
+        user_id (str): The ID of the User object to retrieve.
+
+    Returns:
+        JSON: A dictionary representing the retrieved User object, a 304
+            Not Modified response if the client has it already, or a 404
+            Not Found response if the User is not found.
+    """
+    user = storage.get(User, user_id)
+    if user is None:
+        abort(404)
+    return object_response(user)
 
 
 @app_views.route('/users/<user_id>', methods=['DELETE'], strict_slashes=False)
@@ -31,15 +55,17 @@ def delete_user(user_id):
         user_id (str): The ID of the User object to delete.
 
     Returns:
-        JSON: An empty JSON object with a 200 OK status code if the User is deleted
-            successfully, or a 404 Not Found response if the User is not found.
+        JSON: An empty JSON object with a 200 OK status code if the User is
+            deleted successfully, or a 404 Not Found response if the User is
+            not found.
     """
-  user = storage.get(User, user_id)
-  if user is None:
-    abort(404)
-  storage.delete(user)
-  storage.save()
-  return jsonify({}), 200
+    user = storage.get(User, user_id)
+    if user is None:
+        abort(404)
+    storage.delete(user)
+    storage.save()
+    return jsonify({}), 200
+
 
 @app_views.route('/users', methods=['POST'], strict_slashes=False)
 def create_user():
@@ -47,17 +73,18 @@ def create_user():
     Creates a new User object.
 
     Returns:
-        JSON: A dictionary representing the newly created User object, or a 400 Bad Request
-            response if the request is invalid (e.g., missing required fields, invalid JSON format).
-    """
-  if not request.json:
-    abort(400, "Not a JSON")
-  if 'email' not in request.json:
-    abort(400, "Missing email")
-  if 'password' not in request.json:
-    abort(400, "Missing password")
-  data = request.get_json()
-  user = User(**data)
-  storage.new(user)
-  storage.save()
-  return jsonify(user.to_dict()), 201
+        JSON: A dictionary representing the newly created User object, or a
+            400 Bad Request response if the request is invalid (e.g., missing
+            required fields, invalid JSON format).
+    """
+    if not request.json:
+        abort(400, "Not a JSON")
+    if 'email' not in request.json:
+        abort(400, "Missing email")
+    if 'password' not in request.json:
+        abort(400, "Missing password")
+    data = request.get_json()
+    user = User(**data)
+    storage.new(user)
+    storage.save()
+    return jsonify(user.to_dict()), 201
@@ -0,0 +1,302 @@
+#!/usr/bin/python3
+"""
+Micro benchmarks for the FileStorage engine
+
+Usage: ./benchmarks/storage_bench.py [name ...] [-n size[,size...]]
+Run from the repository root; every benchmark works on a private,
+in-memory copy of the store and never touches file.json.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.engine.snapshot import CODECS  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.review import Review  # noqa: E402
+
+SIZES = [1000, 10000, 100000, 1000000]
+
+
+def populate(storage, size, cls=Place):
+    """fills storage with size fresh objects of cls, returns their ids"""
+    ids = []
+    for _ in range(size):
+        obj = cls()
+        storage.new(obj)
+        ids.append(obj.id)
+    return ids
+
+
+def fresh_storage():
+    """returns a FileStorage whose registry is empty"""
+    storage = FileStorage()
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__by_class = {}
+    FileStorage._FileStorage__pending = {}
+    FileStorage._FileStorage__journal = False
+    FileStorage._FileStorage__dirty = {}
+    FileStorage._FileStorage__journal_size = 0
+    return storage
+
+
+def bench_get(size):
+    """average latency of storage.get on a store of size objects"""
+    storage = fresh_storage()
+    ids = populate(storage, size)
+    target = ids[len(ids) // 2]
+    loops = 10000
+    total = timeit.timeit(lambda: storage.get(Place, target), number=loops)
+    return "get {:>8} objs: {:8.3f} us/op".format(size, total / loops * 1e6)
+
+
+def bench_count(size):
+    """latency of count(Review) when Places dominate the store"""
+    storage = fresh_storage()
+    populate(storage, size)
+    populate(storage, 10, Review)
+    loops = 1000
+    total = timeit.timeit(lambda: (storage.count(Review),
+                                   list(storage.all(Review).values())),
+                          number=loops)
+    return "count/all(Review) {:>8} objs: {:8.3f} us/op".format(
+        size, total / loops * 1e6)
+
+
+def bench_save(size):
+    """latency of one BaseModel.save(), full rewrite vs journal append"""
+    storage = fresh_storage()
+    populate(storage, size)
+    target = Place()
+    storage.new(target)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        for journal in (False, True):
+            FileStorage._FileStorage__journal = journal
+            loops = 20
+            total = timeit.timeit(target.save, number=loops)
+            results.append(total / loops * 1e3)
+    return "save {:>8} objs: full {:9.3f} ms, journal {:6.3f} ms".format(
+        size, *results)
+
+
+def bench_reload(size):
+    """
+    time and peak Python heap of reload, eager vs lazy vs memory-mapped
+    (until the first get); tracemalloc is only on for a second, untimed
+    run of each, and does not count the mapped pages
+    """
+    storage = fresh_storage()
+    ids = populate(storage, size)
+    results = []
+    saved = (FileStorage._FileStorage__format,
+             FileStorage._FileStorage__mmap)
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        for lazy, mapped in ((False, False), (True, False), (True, True)):
+            FileStorage._FileStorage__lazy = lazy
+            FileStorage._FileStorage__mmap = mapped
+            FileStorage._FileStorage__format = "jsonl" if mapped else "json"
+            storage.save()
+            for traced in (False, True):
+                fresh_storage()
+                if traced:
+                    tracemalloc.start()
+                start = time.perf_counter()
+                storage.reload()
+                storage.get(Place, ids[0])
+                elapsed = time.perf_counter() - start
+                if traced:
+                    peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                    results.append(peak / 2 ** 20)
+                else:
+                    results.append(elapsed * 1e3)
+    (FileStorage._FileStorage__format,
+     FileStorage._FileStorage__mmap) = saved
+    return ("reload {:>8} objs: eager {:8.1f} ms {:6.1f} MiB, "
+            "lazy {:8.1f} ms {:6.1f} MiB, mmap {:8.1f} ms {:6.1f} "
+            "MiB".format(size, *results))
+
+
+def bench_codecs(size):
+    """
+    save and reload throughput and file size of each snapshot codec;
+    reload is lazy, so it measures decoding, not building the objects
+    """
+    storage = fresh_storage()
+    populate(storage, size)
+    for obj in storage.all().values():
+        obj.to_json_string()
+    lines = []
+    saved = (FileStorage._FileStorage__format,
+             FileStorage._FileStorage__lazy)
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        FileStorage._FileStorage__lazy = True
+        objects = FileStorage._FileStorage__objects
+        by_class = FileStorage._FileStorage__by_class
+        for name in CODECS:
+            FileStorage._FileStorage__format = name
+            fresh_storage()
+            FileStorage._FileStorage__objects = objects
+            FileStorage._FileStorage__by_class = by_class
+            start = time.perf_counter()
+            storage.save()
+            save = time.perf_counter() - start
+            fresh_storage()
+            start = time.perf_counter()
+            storage.reload()
+            reload = time.perf_counter() - start
+            lines.append("codec {:>7} {:>8} objs: save {:9.0f} objs/s, "
+                         "reload {:9.0f} objs/s, {:6.1f} B/obj".format(
+                             name, size, size / save, size / reload,
+                             os.path.getsize(
+                                 FileStorage._FileStorage__file_path) /
+                             size))
+    (FileStorage._FileStorage__format,
+     FileStorage._FileStorage__lazy) = saved
+    return "\n".join(lines)
+
+
+def bytes_per_object(size):
+    """
+    Python heap per Review after reload and one save, measured in this
+    process, whose model layout was fixed by HBNB_COMPACT_MODELS at import
+    """
+    storage = fresh_storage()
+    template = Review(place_id="p", user_id="u", text="Great stay").to_dict()
+    records = [dict(template, id=str(i)) for i in range(size)]
+    tracemalloc.start()
+    for record in records:
+        obj = Review(**record)
+        storage.new(obj)
+        obj.to_dict()
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return used / size
+
+
+def bench_memory(size):
+    """bytes per stored object, regular vs compact (slotted) models"""
+    results = []
+    for compact in ("0", "1"):
+        env = dict(os.environ, HBNB_COMPACT_MODELS=compact,
+                   HBNB_TYPE_STORAGE="file")
+        done = subprocess.run([sys.executable, os.path.abspath(__file__),
+                               "--bytes-per-object", str(size)],
+                              env=env, stdout=subprocess.PIPE, check=True)
+        results.append(float(done.stdout))
+    return "memory {:>8} objs: regular {:7.1f} B/obj, compact {:7.1f} " \
+        "B/obj".format(size, *results)
+
+
+def bench_iter(size):
+    """
+    peak Python heap of going through every Place of a lazily reloaded
+    store with all(Place) vs iter(Place), the records being in memory
+    """
+    storage = fresh_storage()
+    populate(storage, size)
+    results = []
+    lazy = FileStorage._FileStorage__lazy
+    FileStorage._FileStorage__lazy = True
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        storage.save()
+        for method in (lambda: storage.all(Place).values(),
+                       lambda: storage.iter(Place)):
+            fresh_storage()
+            storage.reload()
+            tracemalloc.start()
+            start = time.perf_counter()
+            for obj in method():
+                obj.to_dict()
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results += [elapsed * 1e3, peak / 2 ** 20]
+    FileStorage._FileStorage__lazy = lazy
+    return "iter {:>8} objs: all {:8.1f} ms {:6.1f} MiB, iter {:8.1f} ms " \
+        "{:6.1f} MiB".format(size, *results)
+
+
+def bench_bulk(size):
+    """
+    rows per second of bulk_upsert inserting size rows into an empty
+    store, then updating them, saved to a snapshot and to a journal
+    """
+    rows = [{"name": "Place {}".format(i), "number_rooms": i % 7}
+            for i in range(size)]
+    results = []
+    compact_every = FileStorage._FileStorage__compact_every
+    # no background compaction of the journal meanwhile
+    FileStorage._FileStorage__compact_every = 2 * size + 1
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        for journal in (False, True):
+            storage = fresh_storage()
+            FileStorage._FileStorage__journal = journal
+            start = time.perf_counter()
+            storage.bulk_upsert(Place, rows)
+            inserted = time.perf_counter() - start
+            updates = [{"id": key.partition('.')[2], "max_guest": 2}
+                       for key in FileStorage._FileStorage__pending["Place"]]
+            start = time.perf_counter()
+            storage.bulk_upsert(Place, updates)
+            results += [size / inserted, size / (time.perf_counter() - start)]
+    FileStorage._FileStorage__compact_every = compact_every
+    return "bulk {:>8} rows: snapshot insert {:9.0f} rows/s, update {:9.0f} " \
+        "rows/s; journal insert {:9.0f} rows/s, update {:9.0f} rows/s".format(
+            size, *results)
+
+
+BENCHMARKS = {"get": bench_get, "count": bench_count, "save": bench_save,
+              "reload": bench_reload, "memory": bench_memory,
+              "codecs": bench_codecs, "bulk": bench_bulk,
+              "iter": bench_iter}
+
+
+def main(argv):
+    """runs the selected benchmarks for each size"""
+    if argv[:1] == ["--bytes-per-object"]:
+        print(bytes_per_object(int(argv[1])))
+        return
+    sizes = SIZES
+    names = []
+    args = iter(argv)
+    for arg in args:
+        if arg == "-n":
+            sizes = [int(n) for n in next(args).split(",")]
+        else:
+            names.append(arg)
+    saved = (FileStorage._FileStorage__objects,
+             FileStorage._FileStorage__by_class,
+             FileStorage._FileStorage__pending,
+             FileStorage._FileStorage__lazy,
+             FileStorage._FileStorage__file_path,
+             FileStorage._FileStorage__journal)
+    try:
+        for name in names or BENCHMARKS:
+            for size in sizes:
+                print(BENCHMARKS[name](size))
+    finally:
+        (FileStorage._FileStorage__objects,
+         FileStorage._FileStorage__by_class,
+         FileStorage._FileStorage__pending,
+         FileStorage._FileStorage__lazy,
+         FileStorage._FileStorage__file_path,
+         FileStorage._FileStorage__journal) = saved
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
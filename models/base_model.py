@@ -3,24 +3,96 @@
 Contains class BaseModel
 """
 
+from copy import copy
 from datetime import datetime
+import json
 import models
 from os import getenv
+import re
 import sqlalchemy
 from sqlalchemy import Column, String, DateTime
 from sqlalchemy.ext.declarative import declarative_base
 import uuid
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
+# the naive times isoformat() writes, which fromisoformat() reads faster
+iso_time = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}"
+                      r"(\.[0-9]{6})?")
+
+
+def parse_time(value):
+    """
+    returns the naive datetime value, or written in the string value as
+    isoformat() or time write it; raises ValueError for anything else,
+    times with an offset included, as they do not compare with the others
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            raise ValueError("time with an offset: {}".format(value))
+        return value
+    if not isinstance(value, str):
+        raise ValueError("not a time: {!r}".format(value))
+    if iso_time.fullmatch(value):
+        return datetime.fromisoformat(value)
+    return datetime.strptime(value, time)
 
 if models.storage_t == "db":
     Base = declarative_base()
 else:
     Base = object
 
+# boolean - keep the attributes of file storage models in __slots__
+compact = models.storage_t != "db" and getenv("HBNB_COMPACT_MODELS") == "1"
+
+if compact:
+    class ModelType(type):
+        """
+        gives each attribute declared in a model class body a slot, so
+        instances have no __dict__; the declared values become the
+        defaults returned until an instance sets the attribute
+        """
+
+        def __new__(mcs, name, bases, namespace):
+            """Creates the class with a slot for each declared attribute"""
+            defaults = {}
+            fields = []
+            for base in bases:
+                defaults.update(getattr(base, "_defaults", {}))
+                fields.extend(field for field in getattr(base, "_fields", ())
+                              if field not in fields)
+            declared = [key for key, value in namespace.items()
+                        if not key.startswith("_") and
+                        not hasattr(value, "__get__")]
+            for key in declared:
+                defaults[key] = namespace.pop(key)
+            namespace.setdefault("__slots__", tuple(declared))
+            fields.extend(field for field in namespace["__slots__"]
+                          if not field.startswith("_") and
+                          field not in fields)
+            namespace["_defaults"] = defaults
+            namespace["_fields"] = tuple(fields)
+            return super().__new__(mcs, name, bases, namespace)
+else:
+    ModelType = type
+
+# boolean - cache to_dict() until the instance changes, which only file
+# storage models report through __setattr__
+cached = models.storage_t != "db" and not compact
+
 
-class BaseModel:
+class BaseModel(metaclass=ModelType):
     """The BaseModel class from which future classes will be derived"""
+    if compact:
+        # __extra - attributes no model declares, created on first use;
+        # no __iso cache, compact models trade it for memory
+        __slots__ = ("id", "created_at", "updated_at", "__extra",
+                     "__weakref__")
+    else:
+        # __iso - {attribute: (datetime, isoformat string)} and __cache -
+        # [to_dict(), copies of its list and dict values, JSON text], kept
+        # in slots so they stay out of __dict__, to_dict() and touch()
+        __slots__ = ("__iso", "__cache", "__dict__", "__weakref__")
+
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
         created_at = Column(DateTime, default=datetime.utcnow)
@@ -33,11 +105,13 @@ class BaseModel:
                 if key != "__class__":
                     setattr(self, key, value)
             if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
+                self.created_at = self.__parse_time("created_at",
+                                                    kwargs["created_at"])
             else:
                 self.created_at = datetime.utcnow()
             if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
+                self.updated_at = self.__parse_time("updated_at",
+                                                    kwargs["updated_at"])
             else:
                 self.updated_at = datetime.utcnow()
             if kwargs.get("id", None) is None:
@@ -47,10 +121,84 @@ class BaseModel:
             self.created_at = datetime.utcnow()
             self.updated_at = self.created_at
 
+    def __iso_cache(self):
+        """returns the cache of the isoformat() of the datetime attributes"""
+        try:
+            return self.__iso
+        except AttributeError:
+            object.__setattr__(self, "_BaseModel__iso", {})
+            return self.__iso
+
+    def __parse_time(self, key, string):
+        """
+        returns the datetime written in string, remembering string as the
+        isoformat() of attribute key when it is written that way; times
+        with an offset are rejected, as they do not compare with the others
+        """
+        value = parse_time(string)
+        if (not compact and iso_time.fullmatch(string) and
+                len(string) == (26 if value.microsecond else 19)):
+            self.__iso_cache()[key] = (value, string)
+        return value
+
+    if models.storage_t != "db":
+        def __setattr__(self, name, value):
+            """sets an attribute and reports the change to the storage"""
+            if compact and not hasattr(type(self), name):
+                self.__extras()[name] = value
+            else:
+                super().__setattr__(name, value)
+            if cached:
+                object.__setattr__(self, "_BaseModel__cache", None)
+            models.storage.touch(self, name)
+
+    if compact:
+        def __getattr__(self, name):
+            """returns an undeclared attribute, or a field default"""
+            if name in self._defaults:
+                return self._defaults[name]
+            try:
+                return object.__getattribute__(self, "_BaseModel__extra")[
+                    name]
+            except (AttributeError, KeyError):
+                raise AttributeError("{!r} object has no attribute {!r}"
+                                     .format(type(self).__name__,
+                                             name)) from None
+
+        @property
+        def __dict__(self):
+            """returns a copy of the attributes of the instance"""
+            return dict(self.__items())
+
+        def __extras(self):
+            """returns the dictionary of the undeclared attributes"""
+            try:
+                return object.__getattribute__(self, "_BaseModel__extra")
+            except AttributeError:
+                object.__setattr__(self, "_BaseModel__extra", {})
+                return self.__extra
+
+    def __items(self):
+        """returns the (name, value) pairs of the instance attributes"""
+        if not compact:
+            return self.__dict__.items()
+        items = []
+        for name in self._fields:
+            try:
+                items.append((name, object.__getattribute__(self, name)))
+            except AttributeError:
+                pass
+        try:
+            items.extend(object.__getattribute__(
+                self, "_BaseModel__extra").items())
+        except AttributeError:
+            pass
+        return items
+
     def __str__(self):
         """String representation of the BaseModel class"""
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
-                                         self.__dict__)
+                                         dict(self.__items()))
 
     def save(self):
         """updates the attribute 'updated_at' with the current datetime"""
@@ -58,16 +206,56 @@ class BaseModel:
         models.storage.new(self)
         models.storage.save()
 
+    def __cached(self):
+        """
+        returns the cache of the instance, rebuilt if an attribute was set
+        or a list or dict value was changed in place since it was made
+        """
+        try:
+            cache = self.__cache
+        except AttributeError:
+            cache = None
+        if cache is None or any(cache[0][key] != value
+                                for key, value in cache[1]):
+            dictionary = self.__to_dict(True)
+            mutables = [(key, copy(value))
+                        for key, value in dictionary.items()
+                        if isinstance(value, (list, dict))]
+            cache = [dictionary, mutables, None]
+            object.__setattr__(self, "_BaseModel__cache", cache)
+        return cache
+
     def to_dict(self, exclude_password=True):
         """returns a dictionary containing all keys/values of the instance"""
+        if cached and exclude_password:
+            return dict(self.__cached()[0])
+        return self.__to_dict(exclude_password)
+
+    def to_json_string(self):
+        """returns the JSON representation of to_dict()"""
+        if not cached:
+            return json.dumps(self.to_dict())
+        cache = self.__cached()
+        if cache[2] is None:
+            cache[2] = json.dumps(cache[0])
+        return cache[2]
+
+    def __to_dict(self, exclude_password):
+        """builds the dictionary returned by to_dict()"""
         dictionary = {}
-        for key, value in self.__dict__.items():
+        iso = None if compact else self.__iso_cache()
+        for key, value in self.__items():
             if key == '__sa_instance_state':
                 continue
             if key == 'password' and exclude_password:
                 continue
-            if isinstance(value, datetime):
+            if isinstance(value, datetime) and iso is None:
                 dictionary[key] = value.isoformat()
+            elif isinstance(value, datetime):
+                cached = iso.get(key)
+                if cached is None or cached[0] is not value:
+                    cached = iso[key] = (value, value.isoformat())
+                dictionary[key] = cached[1]
             else:
                 dictionary[key] = value
         dictionary['__class__'] = self.__class__.__name__
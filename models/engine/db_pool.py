@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+"""
+Contains the TimedQueuePool class
+"""
+
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import QueuePool
+import threading
+import time
+
+
+class TimedQueuePool(QueuePool):
+    """
+    a QueuePool that also measures how long checkouts wait for a
+    connection, and how many give up after pool_timeout seconds
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Instantiate the pool, with its statistics at zero"""
+        super().__init__(*args, **kwargs)
+        self.__stats_lock = threading.Lock()
+        self.__waits = 0
+        self.__wait_time = 0.0
+        self.__max_wait = 0.0
+        self.__timeouts = 0
+
+    def _do_get(self):
+        """checks out a connection, timing the wait"""
+        start = time.monotonic()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            waited = time.monotonic() - start
+            with self.__stats_lock:
+                self.__waits += 1
+                self.__wait_time += waited
+                self.__max_wait = max(self.__max_wait, waited)
+                self.__timeouts += timed_out
+
+    def stats(self):
+        """returns the size, usage and wait statistics of the pool"""
+        with self.__stats_lock:
+            return {"size": self.size(),
+                    "checked_in": self.checkedin(),
+                    "checked_out": self.checkedout(),
+                    "overflow": self.overflow(),
+                    "timeout": self.timeout(),
+                    "checkouts": self.__waits,
+                    "wait_time": self.__wait_time,
+                    "max_wait": self.__max_wait,
+                    "timeouts": self.__timeouts}
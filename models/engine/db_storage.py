@@ -3,27 +3,50 @@
 Contains the class DBStorage
 """
 
+from datetime import datetime
+import hashlib
 import models
 from models.amenity import Amenity
-from models.base_model import BaseModel, Base
+from models.base_model import BaseModel, Base, parse_time
 from models.city import City
+from models.engine.db_pool import TimedQueuePool
+from models.engine.group_commit import GroupCommit, GroupState
+from models.engine.write_hooks import WriteHooks
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import and_, create_engine, func, literal, or_, select
+from sqlalchemy import union_all
+from sqlalchemy import Column, DateTime, Integer, String, Table
+from sqlalchemy import Index, event, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import configure_mappers, joinedload, scoped_session
+from sqlalchemy.orm import selectinload, sessionmaker
+import uuid
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+loaders = {"selectin": selectinload, "joined": joinedload}
+# the generation of each table, bumped in the transaction of every commit
+# writing to it, and the time of that commit
+if models.storage_t == 'db':
+    generations = Table('hbnb_generations', Base.metadata,
+                        Column('name', String(60), primary_key=True),
+                        Column('generation', Integer, nullable=False,
+                               default=0),
+                        Column('modified', DateTime, nullable=True))
 
 
-class DBStorage:
+class DBStorage(GroupCommit, WriteHooks):
     """interaacts with the MySQL database"""
+    # sessions are per thread, so a timer thread could not commit them
+    group_timer = False
     __engine = None
     __session = None
+    __counts = None
 
     def __init__(self):
         """Instantiate a DBStorage object"""
@@ -32,34 +55,195 @@ class DBStorage:
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+        # any SQLAlchemy URL, such as a SQLite file to test against
+        url = getenv('HBNB_MYSQL_URL') or 'mysql+mysqldb://{}:{}@{}/{}'.\
+            format(HBNB_MYSQL_USER, HBNB_MYSQL_PWD, HBNB_MYSQL_HOST,
+                   HBNB_MYSQL_DB)
+        options = {"poolclass": TimedQueuePool,
+                   "pool_pre_ping": getenv('HBNB_MYSQL_POOL_PRE_PING') == "1"}
+        for name, option, kind in (("HBNB_MYSQL_POOL_SIZE", "pool_size", int),
+                                   ("HBNB_MYSQL_MAX_OVERFLOW",
+                                    "max_overflow", int),
+                                   ("HBNB_MYSQL_POOL_RECYCLE",
+                                    "pool_recycle", int),
+                                   ("HBNB_MYSQL_POOL_TIMEOUT",
+                                    "pool_timeout", float)):
+            if getenv(name):
+                options[option] = kind(getenv(name))
+        self.__engine = create_engine(url, **options)
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
+        self.__counts = {}
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    @staticmethod
+    def _load_options(cls, load):
+        """
+        returns the loader options eagerly loading the relationships of
+        cls named by load: a list of paths such as "cities.places", loaded
+        with a SELECT ... IN per level, or a dictionary mapping each path
+        to its strategy, "selectin" or "joined"
+        """
+        if not load:
+            return []
+        if not isinstance(load, dict):
+            load = dict.fromkeys(load, "selectin")
+        configure_mappers()
+        options = []
+        for path, strategy in load.items():
+            if strategy not in loaders:
+                raise ValueError("unknown loading strategy: {}".format(
+                    strategy))
+            option = None
+            owner = cls
+            for name in path.split('.'):
+                relationship = owner.__mapper__.relationships.get(name)
+                if relationship is None:
+                    raise ValueError("{} has no relationship {}".format(
+                        owner.__name__, name))
+                attr = getattr(owner, name)
+                if option is None:
+                    option = loaders[strategy](attr)
+                else:
+                    option = getattr(option, loaders[strategy].__name__)(
+                        attr)
+                owner = relationship.mapper.class_
+            options.append(option)
+        return options
+
+    def all(self, cls=None, load=None):
+        """
+        query on the current database session; load names relationships
+        of cls to load along with it (see _load_options)
+        """
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+                options = self._load_options(classes[clss], load)
+                objs = self.__session.query(classes[clss]).options(
+                    *options).all()
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
         return (new_dict)
 
+    def iter(self, cls=None, batch_size=1000, where=None):
+        """
+        yields the objects of class cls, or of every class, whose
+        attributes equal where, fetching batch_size rows at a time through
+        a server-side cursor where the driver has one, so memory stays flat
+        """
+        for clss in classes:
+            if cls is None or cls is classes[clss] or cls is clss:
+                query = select(classes[clss]).filter_by(
+                    **(where or {})).execution_options(yield_per=batch_size)
+                yield from self.__session.scalars(query)
+
     def new(self, obj):
         """add the object to the current database session"""
         if isinstance(obj, User) and obj.password is not None:
-           obj.password = hashlib.md5(obj.password.encode()).hexdigest()
+            obj.password = hashlib.md5(obj.password.encode()).hexdigest()
         self.__session.add(obj)
 
-    def save(self):
-        """commit all changes of the current database session"""
+    def bulk_new(self, objs):
+        """
+        adds every object of objs to the current database session, then
+        commits them at once, the INSERTs of each table being batched
+        """
+        objs = list(objs)
+        for obj in objs:
+            if isinstance(obj, User) and obj.password is not None:
+                obj.password = hashlib.md5(obj.password.encode()).hexdigest()
+        self.__session.add_all(objs)
+        self.save()
+
+    def bulk_upsert(self, cls, rows):
+        """
+        updates the rows of the table of cls whose id is in one of rows, a
+        sequence of attribute dictionaries, and inserts the others, with
+        one executemany() INSERT and UPDATE, then commits them; raises
+        ValueError, writing nothing, if a row has a time BaseModel could
+        not read
+        """
+        if isinstance(cls, str):
+            cls = classes[cls]
+        columns = set(cls.__table__.columns.keys())
+        now = datetime.utcnow()
+        merged = {}
+        for row in rows:
+            row = {attr: value for attr, value in row.items()
+                   if attr in columns}
+            for attr in ("created_at", "updated_at"):
+                if row.get(attr) is not None:
+                    row[attr] = parse_time(row[attr])
+            if cls is User and row.get("password") is not None:
+                row["password"] = hashlib.md5(
+                    row["password"].encode()).hexdigest()
+            if row.get("id") is None:
+                row["id"] = str(uuid.uuid4())
+            merged.setdefault(row["id"], {}).update(row)
+        ids = list(merged)
+        existing = set()
+        for i in range(0, len(ids), 500):
+            existing.update(self.__session.scalars(
+                select(cls.id).where(cls.id.in_(ids[i:i + 500]))))
+        inserts = []
+        updates = []
+        for id, row in merged.items():
+            if id in existing:
+                row.pop("created_at", None)
+                row["updated_at"] = now
+                updates.append(row)
+            else:
+                row.setdefault("created_at", now)
+                row.setdefault("updated_at", now)
+                inserts.append(row)
+        if inserts:
+            self.__session.execute(insert(cls), inserts)
+        if updates:
+            self.__session.execute(update(cls), updates)
+        # executed without the ORM, so the flushes do not see them
+        self.__session.info.setdefault("written", set()).add(cls.__name__)
+        self.save()
+
+    def _group_state(self):
+        """
+        returns the GroupState of the current session, as each thread
+        commits its own session: a shared count would flush one thread's
+        session for the saves of another, leaving its own uncommitted
+        """
+        return self.__session.info.setdefault("group", GroupState())
+
+    def flush(self):
+        """
+        commit all changes of the current database session, bumping the
+        generations of the tables written in the same transaction, then
+        run the write hooks for the classes of the objects it wrote
+        """
+        self.__session.flush()
+        written = self.__session.info.pop("written", None)
+        if written:
+            self.__session.execute(
+                update(generations)
+                .where(generations.c.name.in_(sorted(written)))
+                .values(generation=generations.c.generation + 1,
+                        modified=datetime.utcnow()))
         self.__session.commit()
+        self._written(written)
+
+    def rollback(self):
+        """roll back all changes of the current database session"""
+        self.__session.rollback()
+        self.__session.info.pop("written", None)
+
+    @staticmethod
+    def _track(session, flush_context, instances):
+        """
+        remembers in session.info the classes of the objects each flush of
+        session writes, so flush() runs the write hooks after the commit
+        """
+        written = session.info.setdefault("written", set())
+        for objs in (session.new, session.dirty, session.deleted):
+            written.update(obj.__class__.__name__ for obj in objs)
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
@@ -69,34 +253,179 @@ class DBStorage:
     def reload(self):
         """reloads data from the database"""
         Base.metadata.create_all(self.__engine)
+        for cls in classes.values():
+            # the keyset of page()
+            self.__create_index(cls.__table__, "created_at", "id")
+        with self.__engine.connect() as conn:
+            known = set(conn.scalars(select(generations.c.name)))
+        missing = [{"name": name, "generation": 0}
+                   for name in classes if name not in known]
+        if missing:
+            try:
+                with self.__engine.begin() as conn:
+                    conn.execute(insert(generations), missing)
+            except IntegrityError:
+                # another process inserted them first
+                pass
         sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        event.listen(sess_factory, "before_flush", self._track)
         Session = scoped_session(sess_factory)
         self.__session = Session
-               
-   def get(self, cls, id):
-       """fetches an object using classname and id"""
-       all_class = self.all(cls)
-       for obj in all_class.values():
-           if id == str(obj.id):
-              return obj
-       return None
 
-   def count(self, cls=None):
+    def get(self, cls, id, load=None):
         """
-            returns count of all obj in storage
+        returns the object based on the class (or class name) and its ID,
+        or None if not found; load is as in all()
         """
-        return (len(self.all(cls)))
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls is None or id is None:
+            return None
+        return self.__session.get(cls, id,
+                                  options=self._load_options(cls, load))
+
+    def get_many(self, cls, ids, load=None):
+        """
+        returns the objects of class cls (or class name) whose ID is in
+        ids, once each and in the order of ids, leaving out those not
+        found, read with one SELECT ... IN per 500 IDs; load is as in all()
+        """
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls is None:
+            return []
+        ids = [id for id in dict.fromkeys(ids) if id is not None]
+        options = self._load_options(cls, load)
+        found = {}
+        for i in range(0, len(ids), 500):
+            query = select(cls).where(cls.id.in_(ids[i:i + 500])).options(
+                *options)
+            found.update((obj.id, obj)
+                         for obj in self.__session.scalars(query).unique())
+        return [found[id] for id in ids if id in found]
+
+    def find(self, cls, **criteria):
+        """
+        returns the list of objects of class cls whose attributes equal
+        criteria
+        """
+        if isinstance(cls, str):
+            cls = classes[cls]
+        return self.__session.query(cls).filter_by(**criteria).all()
+
+    def create_index(self, cls, attr, kind="hash"):
+        """
+        creates a database index on the column attr of the table of cls;
+        B-tree indexes serve both kinds, so kind is only validated
+        """
+        if kind not in ("hash", "sorted"):
+            raise ValueError("unknown index kind: {}".format(kind))
+        if isinstance(cls, str):
+            cls = classes[cls]
+        self.__create_index(cls.__table__, attr)
+
+    def __create_index(self, table, *attrs):
+        """creates the index of table on the columns attrs if missing"""
+        name = "ix_{}_{}".format(table.name, "_".join(attrs))
+        for index in table.indexes:
+            if index.name == name:
+                break
+        else:
+            index = Index(name, *[table.c[attr] for attr in attrs])
+        index.create(bind=self.__engine, checkfirst=True)
+
+    def range(self, cls, attr, lo=None, hi=None):
+        """
+        returns the objects of class cls whose attribute attr is between
+        lo and hi (both included, None meaning unbounded), sorted on attr
+        """
+        if isinstance(cls, str):
+            cls = classes[cls]
+        column = getattr(cls, attr)
+        query = self.__session.query(cls).filter(column.isnot(None))
+        if lo is not None:
+            query = query.filter(column >= lo)
+        if hi is not None:
+            query = query.filter(column <= hi)
+        return query.order_by(column).all()
+
+    def page(self, cls, after=None, limit=100, where=None):
+        """
+        returns up to limit objects of class cls whose attributes equal
+        where, ordered by (created_at, id) and starting after the pair
+        after: a range scan of the (created_at, id) index
+        """
+        if isinstance(cls, str):
+            cls = classes[cls]
+        query = self.__session.query(cls).filter_by(**(where or {}))
+        if after is not None:
+            created_at, id = after
+            query = query.filter(or_(cls.created_at > created_at,
+                                     and_(cls.created_at == created_at,
+                                          cls.id > id)))
+        return query.order_by(cls.created_at, cls.id).limit(limit).all()
+
+    def count(self, cls=None):
+        """
+        count the number of objects in storage, or of class cls only
+        """
+        return sum(self.count_many(classes if cls is None else [cls])
+                   .values())
+
+    def count_many(self, cls_list):
+        """
+        returns the number of objects of each class (or class name) of
+        cls_list, by class name, reading the generations of their tables
+        once for them all; counts are cached along with those generations,
+        and only when the session has no changes its queries would count
+        before they are committed
+        """
+        names = [cls if isinstance(cls, str) else cls.__name__
+                 for cls in cls_list]
+        known = [name for name in names if name in classes]
+        if not known:
+            return dict.fromkeys(names, 0)
+        session = self.__session
+        pending = bool(session.new or session.dirty or session.deleted or
+                       session.info.get("written"))
+        current = dict(session.execute(select(
+            generations.c.name, generations.c.generation)).all())
+        if pending or any(name not in self.__counts or
+                          self.__counts[name][0] != current.get(name)
+                          for name in known):
+            query = union_all(*[select(literal(name), func.count())
+                                .select_from(classes[name])
+                                for name in classes])
+            counts = dict(session.execute(query).all())
+            if not pending:
+                self.__counts.update((name, (current.get(name), count))
+                                     for name, count in counts.items())
+        else:
+            counts = {name: self.__counts[name][1] for name in known}
+        return {name: counts.get(name, 0) for name in names}
+
+    def version(self, cls):
+        """
+        returns (tag, modified) for the table of cls: its generation, which
+        every commit writing to it bumps, deletes included, and which every
+        process reads alike, and the time of that commit, or None
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        row = self.__session.execute(
+            select(generations.c.generation, generations.c.modified).where(
+                generations.c.name == name)).one_or_none()
+        if row is None:
+            return 0, None
+        return row.generation, row.modified
+
+    def metrics(self):
+        """returns the statistics of the connection pool"""
+        return {"pool": self.__engine.pool.stats()}
 
     def close(self):
-        """call remove() method on the private session attribute"""
-        self.__session.remove()
-      
-    """def get(self,cls,id):
         """
-            fetches one object, using classname and id
+        commit pending saves, then call remove() method on the private
+        session attribute
         """
-        if cls and id:
-            get_key = "{}.{}".format(cls, id)
-            all_objects = self.all(cls)
-            return all_objects.get(get_key)
-        return None"""
+        self.flush_pending()
+        self.__session.remove()
@@ -3,87 +3,971 @@
 Contains the FileStorage class
 """
 
+import bisect
+from contextlib import contextmanager
+from datetime import datetime
+import hashlib
 import json
+import mmap
+import os
 from models.amenity import Amenity
-from models.base_model import BaseModel
+from models.base_model import BaseModel, parse_time
 from models.city import City
+from models.engine.group_commit import GroupCommit
+from models.engine.indexes import HashIndex, SortedIndex
+from models.engine.snapshot import CODECS, ChecksumWriter, MappedRecord
+from models.engine.snapshot import detect, to_json
+from models.engine.write_hooks import WriteHooks
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+import tempfile
+import threading
+import time
+from types import MappingProxyType
+import uuid
+import zlib
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# dictionary - the class name each relationship property leads to, by
+# <class name> then property
+relationships = {"State": {"cities": "City"},
+                 "City": {"places": "Place"},
+                 "Place": {"reviews": "Review", "amenities": "Amenity"}}
 
 
-class FileStorage:
+class FileStorage(GroupCommit, WriteHooks):
     """serializes instances to a JSON file & deserializes back to instances"""
 
     # string - path to the JSON file
     __file_path = "file.json"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - the same objects partitioned by <class name>
+    __by_class = {}
+    # dictionary - records read by reload but not turned into objects
+    # yet, by <class name> then <class name>.id
+    __pending = {}
+    # boolean - turn records into objects on first access only
+    __lazy = os.getenv("HBNB_FILE_LAZY", "1") == "1"
+    # boolean - leave the records of jsonl snapshots in a memory map of
+    # the file, indexed by <class name>.id, until they are accessed
+    __mmap = os.getenv("HBNB_FILE_MMAP") == "1"
+    # dictionary - indexes on the attributes of each <class name>; hash
+    # indexes keep their buckets in (created_at, id) order for page()
+    __indexes = {"City": {"state_id": HashIndex("state_id", "created_at")},
+                 "Place": {"city_id": HashIndex("city_id", "created_at")},
+                 "Review": {"place_id": HashIndex("place_id", "created_at")}}
+    # boolean - several processes share the files: changes are appended
+    # to the journal under a lock on <file>.lock, and each process
+    # replays the records the others appended (implies __journal)
+    __shared = os.getenv("HBNB_FILE_SHARED") == "1"
+    # boolean - append changes to a journal instead of rewriting the file
+    __journal = os.getenv("HBNB_FILE_JOURNAL") == "1" or __shared
+    # integer - journal records after which a compaction is started
+    __compact_every = int(os.getenv("HBNB_FILE_COMPACT", "10000"))
+    # dictionary - objects changed since the last save by <class name>.id,
+    # None for deleted ones
+    __dirty = {}
+    # integer - records appended to the journal since the last compaction
+    __journal_size = 0
+    __lock = threading.RLock()
+    __compacting = False
+    # string - when writes are fsynced: "always", "batched" or "never";
+    # files replacing others are synced unless "never", while "batched"
+    # syncs journal appends at most once every __fsync_interval seconds,
+    # the last ones by __sync_timer
+    __fsync = os.getenv("HBNB_FILE_FSYNC", "batched")
+    __fsync_interval = float(os.getenv("HBNB_FILE_FSYNC_INTERVAL", "1"))
+    __last_fsync = 0.0
+    __sync_timer = None
+    # boolean - end snapshots with a "#crc32:<hex>" footer line
+    __checksum = os.getenv("HBNB_FILE_CHECKSUM") == "1"
+    # string - codec snapshots are written with: "json", "jsonl",
+    # "pickle" or "marshal" (see models/engine/snapshot.py); reload
+    # recognizes the codec of the file it reads
+    __format = os.getenv("HBNB_FILE_FORMAT", "jsonl" if __mmap else "json")
+    # tuple - (inode, size, mtime) of the snapshot and journal files when
+    # this process last read or wrote them
+    __signature = None
+    # integers - reloads done, and skipped by close() as nothing changed
+    __reloads = 0
+    __reloads_skipped = 0
+    # integer - generation of the snapshot in the shared mode, bumped by
+    # every compaction and written at the head of the journal
+    __generation = 0
+    # tuple - (inode, offset) of the end of the journal records applied
+    # by this process
+    __journal_pos = (None, 0)
+    # the lock file while held, how many times, and the mutex keeping the
+    # other threads out meanwhile
+    __lock_file = None
+    __lock_depth = 0
+    __lock_mutex = threading.RLock()
+    # integer - journal records of other processes applied by close()
+    __catch_ups = 0
+    # dictionary - (writes, time of the last one) to the objects of each
+    # <class name>, so readers can tell a class did not change
+    __versions = {}
+    # string - tells the versions counted by this process from another's
+    __token = uuid.uuid4().hex
+    # set - names of the classes written since the write hooks last ran,
+    # and how many batched() blocks hold the hooks back
+    __written = set()
+    __batch = 0
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
+    @staticmethod
+    def _class_name(cls):
+        """returns the class name of cls, given a class or a string"""
+        return cls if isinstance(cls, str) else cls.__name__
+
+    def all(self, cls=None, load=None):
+        """
+        returns the dictionary __objects, or a read-only view of the
+        objects of class cls only; load names relationships of cls whose
+        objects are built as well (see __load_related)
+        """
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            name = self._class_name(cls)
+            self.__materialize(name)
+            self.__load_related(name, load)
+            return MappingProxyType(self.__by_class.get(name, {}))
+        self.__materialize()
         return self.__objects
 
+    def iter(self, cls=None, batch_size=1000, where=None):
+        """
+        yields the objects of class cls, or of every class, one at a time,
+        keeping those whose attributes equal where; records still pending
+        are matched and built for the caller only and not kept, so memory
+        stays flat (batch_size only matters to DBStorage)
+        """
+        where = where or {}
+        names = list(classes) if cls is None else [self._class_name(cls)]
+        for name in names:
+            found = None
+            for attr, value in where.items():
+                index = self.__indexes.get(name, {}).get(attr)
+                if index is not None:
+                    found = index.find(value)
+                    break
+            if found is None:
+                found = self.__by_class.get(name, {}).values()
+            for obj in list(found):
+                if all(getattr(obj, attr, None) == value
+                       for attr, value in where.items()):
+                    yield obj
+            for key, record in list(self.__pending.get(name, {}).items()):
+                obj = self.__objects.get(key)
+                if obj is not None:
+                    if all(getattr(obj, attr, None) == value
+                           for attr, value in where.items()):
+                        yield obj
+                    continue
+                if key not in self.__pending.get(name, ()):
+                    continue
+                if isinstance(record, MappedRecord):
+                    record = record.load()
+                if all(record.get(attr) == value
+                       for attr, value in where.items()):
+                    yield self.__build(record)
+
+    def __materialize(self, name=None):
+        """
+        turns the pending records of class name, or of every class, into
+        objects; each record stays pending until its object is built, so
+        one that fails to build loses none of the others
+        """
+        if not self.__pending or name is not None and \
+                name not in self.__pending:
+            return
+        with self.__lock:
+            names = list(self.__pending) if name is None else [name]
+            for each in names:
+                for key, record in list(self.__pending.get(each,
+                                                           {}).items()):
+                    self.__register(key, self.__build(record))
+
+    def __load_related(self, name, load):
+        """
+        builds the objects of the classes the relationship paths in load
+        (such as "cities.places") lead to from class name, so that going
+        through them builds no object one at a time; the relationships
+        themselves are index lookups
+        """
+        for path in load or ():
+            owner = name
+            for attr in path.split('.'):
+                if attr not in relationships.get(owner, {}):
+                    raise ValueError("{} has no relationship {}".format(
+                        owner, attr))
+                owner = relationships[owner][attr]
+                self.__materialize(owner)
+
+    @staticmethod
+    def __build(record):
+        """returns the object described by a pending record"""
+        if isinstance(record, MappedRecord):
+            record = record.load()
+        return classes[record["__class__"]](**record)
+
+    def __unpend(self, key):
+        """removes and returns the pending record of key, if any"""
+        name = key.partition('.')[0]
+        records = self.__pending.get(name)
+        if not records or key not in records:
+            return None
+        record = records.pop(key)
+        if not records:
+            del self.__pending[name]
+        return record
+
+    def __register(self, key, obj):
+        """stores obj under key in __objects and in its class bucket"""
+        name = key.partition('.')[0]
+        self.__unpend(key)
+        self.__objects[key] = obj
+        self.__by_class.setdefault(name, {})[key] = obj
+        for index in self.__indexes.get(name, {}).values():
+            index.add(key, obj)
+
+    def __unregister(self, key):
+        """removes key from __objects and from its class bucket"""
+        self.__unpend(key)
+        if key in self.__objects:
+            name = key.partition('.')[0]
+            del self.__objects[key]
+            self.__by_class.get(name, {}).pop(key, None)
+            for index in self.__indexes.get(name, {}).values():
+                index.remove(key)
+
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if isinstance(obj, User) and obj.password is not None:
-           obj.password = hashlib.md5(obj.password.encode()).hexdigest()
-        self.__objects[obj.to_dict(exclude_password=False)
-                       ['__class__'] + '.' + obj.id] = obj
+            obj.password = hashlib.md5(obj.password.encode()).hexdigest()
+        key = obj.__class__.__name__ + '.' + obj.id
+        self.__register(key, obj)
+        self.__bump(obj.__class__.__name__)
+        if self.__journal:
+            self.__dirty[key] = obj
+
+    def bulk_new(self, objs):
+        """
+        sets in __objects every object of objs, as new() does, then saves
+        them all with a single snapshot or journal write
+        """
+        with self.__lock, self.__batched():
+            for obj in objs:
+                self.new(obj)
+        self.save()
+
+    def bulk_upsert(self, cls, rows):
+        """
+        updates the objects of class cls whose id is in one of rows, a
+        sequence of attribute dictionaries, and inserts the others, then
+        saves them with a single write; inserted rows, and updated ones
+        not built yet, stay records until they are accessed; raises
+        ValueError, writing nothing, if a row has a time BaseModel could
+        not read
+        """
+        name = self._class_name(cls)
+        if name not in classes:
+            raise ValueError("unknown class: {}".format(name))
+        now = datetime.utcnow()
+        stamp = now.isoformat()
+        checked = []
+        for row in rows:
+            row = dict(row)
+            for attr in ("created_at", "updated_at"):
+                if row.get(attr) is not None:
+                    row[attr] = parse_time(row[attr])
+            checked.append({attr: value.isoformat()
+                            if isinstance(value, datetime) else value
+                            for attr, value in row.items()
+                            if attr != "__class__"})
+        with self.__lock, self.__batched():
+            for row in checked:
+                if name == "User" and row.get("password") is not None:
+                    row["password"] = hashlib.md5(
+                        row["password"].encode()).hexdigest()
+                if row.get("id") is None:
+                    # a new id, which no object or record can have yet
+                    row["id"] = str(uuid.uuid4())
+                    key = name + '.' + row["id"]
+                    record = None
+                else:
+                    key = name + '.' + str(row["id"])
+                    obj = self.__objects.get(key)
+                    if obj is not None:
+                        for attr, value in row.items():
+                            if attr not in ("id", "created_at",
+                                            "updated_at"):
+                                setattr(obj, attr, value)
+                        obj.updated_at = now
+                        continue
+                    record = self.__unpend(key)
+                if record is None:
+                    record = {"created_at": stamp, "updated_at": stamp}
+                else:
+                    if isinstance(record, MappedRecord):
+                        record = record.load()
+                    row.pop("created_at", None)
+                    row["updated_at"] = stamp
+                record.update(row)
+                record["__class__"] = name
+                self.__pending.setdefault(name, {})[key] = record
+                if self.__journal:
+                    self.__dirty[key] = record
+            self.__bump(name)
+        self.save()
+
+    def __bump(self, name):
+        """
+        counts a write to the objects of class name, then runs the write
+        hooks unless within batched()
+        """
+        writes = self.__versions.get(name, (0, None))[0]
+        self.__versions[name] = (writes + 1, time.time())
+        self.__written.add(name)
+        if not self.__batch:
+            self.__fire()
 
-    def save(self):
+    def __fire(self):
+        """runs the write hooks for the classes written since last time"""
+        names = self.__written
+        if names:
+            FileStorage.__written = set()
+            self._written(names)
+
+    @contextmanager
+    def __batched(self):
+        """
+        holds the write hooks back until the end of the block, so that
+        they run once per class written in it
+        """
+        FileStorage.__batch += 1
+        try:
+            yield
+        finally:
+            FileStorage.__batch -= 1
+            if not self.__batch:
+                self.__fire()
+
+    def version(self, cls):
+        """
+        returns (tag, modified) for the objects of class cls: a value that
+        changes with every write to them, and the UTC datetime of the
+        last one, or None if this process saw none
+        """
+        writes, stamp = self.__versions.get(self._class_name(cls), (0, None))
+        modified = None if stamp is None else datetime.utcfromtimestamp(stamp)
+        return (self.__token, writes), modified
+
+    def touch(self, obj, attr=None):
+        """records that the attribute attr of obj changed"""
+        name = obj.__class__.__name__
+        key = name + '.' + str(getattr(obj, 'id', None))
+        if self.__objects.get(key) is not obj:
+            return
+        self.__bump(name)
+        if self.__journal:
+            self.__dirty[key] = obj
+        for index in self.__indexes.get(name, {}).values():
+            if attr == index.attr or attr == getattr(index, "order", None):
+                index.add(key, obj)
+
+    def __sync(self, f, append=False):
+        """
+        flushes f to disk unless the __fsync policy is "never"; under
+        "batched", an append to the journal synced less than
+        __fsync_interval seconds after the last sync is left to a timer
+        """
+        if self.__fsync == "never":
+            return False
+        f.flush()
+        now = time.monotonic()
+        if append and self.__fsync == "batched":
+            wait = self.__last_fsync + self.__fsync_interval - now
+            if wait > 0:
+                with self.__lock:
+                    if self.__sync_timer is None:
+                        timer = threading.Timer(wait, self.__sync_journal)
+                        timer.daemon = True
+                        FileStorage.__sync_timer = timer
+                        timer.start()
+                return False
+        os.fsync(f.fileno())
+        FileStorage.__last_fsync = now
+        return True
+
+    def __sync_journal(self):
+        """syncs the journal appends __sync left to the timer"""
+        with self.__lock:
+            FileStorage.__sync_timer = None
+            try:
+                fd = os.open(self.__file_path + ".journal", os.O_RDONLY)
+            except FileNotFoundError:
+                return
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            FileStorage.__last_fsync = time.monotonic()
+
+    @contextmanager
+    def __locked(self, exclusive):
+        """
+        holds the lock file of the shared mode, exclusively or not, for
+        the block; a thread already holding it keeps its hold
+        """
+        if not self.__shared:
+            yield
+            return
+        if fcntl is None:
+            raise OSError("HBNB_FILE_SHARED needs fcntl locks")
+        with self.__lock_mutex:
+            if not self.__lock_depth:
+                f = open(self.__file_path + ".lock", 'a')
+                try:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive
+                                else fcntl.LOCK_SH)
+                except BaseException:
+                    f.close()
+                    raise
+                FileStorage.__lock_file = f
+            FileStorage.__lock_depth += 1
+            try:
+                yield
+            finally:
+                FileStorage.__lock_depth -= 1
+                if not self.__lock_depth:
+                    # closing the file releases the lock
+                    self.__lock_file.close()
+                    FileStorage.__lock_file = None
+
+    def __codec(self):
+        """returns the codec named by __format"""
+        if self.__format not in CODECS:
+            raise ValueError("unknown snapshot format: {}".format(
+                self.__format))
+        return CODECS[self.__format]
+
+    def __dump(self, objects):
+        """
+        writes the objects of the (key, obj) iterable to __file_path
+        through a temporary file, so a crash never leaves it half written
+        """
+        codec = self.__codec()
+        folder = os.path.dirname(os.path.abspath(self.__file_path))
+        fd, tmp = tempfile.mkstemp(dir=folder, prefix=".file.json.")
+        try:
+            os.chmod(tmp, 0o644)
+            with os.fdopen(fd, 'wb') as f:
+                if self.__checksum:
+                    writer = ChecksumWriter(f)
+                    codec.dump(objects, writer)
+                    f.write("\n#crc32:{:08x}\n".format(writer.crc).encode())
+                else:
+                    codec.dump(objects, f)
+                synced = self.__sync(f)
+            os.replace(tmp, self.__file_path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        FileStorage.__signature = self.__stat()
+        if synced:
+            dir_fd = os.open(folder, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    def __snapshot(self):
+        """
+        returns the (key, obj) pairs of __objects followed by the
+        (key, record) pairs of the records still pending
+        """
+        items = list(self.__objects.items())
+        for records in self.__pending.values():
+            items.extend(records.items())
+        return items
+
+    def flush(self):
         """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        if not self.__journal:
+            self.__dump(self.__snapshot())
+            return
+        with self.__locked(True), self.__lock:
+            if not self.__dirty:
+                return
+            if self.__shared:
+                self.__catch_up()
+            self.__end_line(self.__file_path + ".journal")
+            with open(self.__file_path + ".journal", 'a') as f:
+                if self.__shared and not os.fstat(f.fileno()).st_size:
+                    f.write(self.__header(self.__generation))
+                for key, obj in self.__dirty.items():
+                    f.write('[' + json.dumps(key))
+                    if obj is not None:
+                        f.write(',' + to_json(obj))
+                    f.write(']\n')
+                self.__sync(f, append=True)
+                if self.__shared:
+                    f.flush()
+                    st = os.fstat(f.fileno())
+                    FileStorage.__journal_pos = (st.st_ino, st.st_size)
+            FileStorage.__signature = self.__stat()
+            FileStorage.__journal_size += len(self.__dirty)
+            self.__dirty.clear()
+            if (self.__journal_size >= self.__compact_every and
+                    not self.__compacting):
+                FileStorage.__compacting = True
+                threading.Thread(target=self.compact, daemon=True).start()
 
-    def reload(self):
-        """deserializes the JSON file to __objects"""
+    @staticmethod
+    def __end_line(path):
+        """
+        ends the file at path with a newline if a write torn by a crash
+        left its last record unfinished, so that the records appended
+        next are not glued to it
+        """
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except:
+            with open(path, 'rb+') as f:
+                if f.seek(0, os.SEEK_END):
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        f.write(b"\n")
+        except FileNotFoundError:
             pass
 
+    @staticmethod
+    def __header(generation):
+        """returns the first line of a journal of the shared mode"""
+        return json.dumps(["#generation", generation]) + "\n"
+
+    def compact(self):
+        """folds the journal into a new snapshot in __file_path"""
+        journal = self.__file_path + ".journal"
+        if self.__shared:
+            try:
+                self.__compact_shared(journal)
+            finally:
+                FileStorage.__compacting = False
+            return
+        with self.__lock:
+            FileStorage.__compacting = True
+            if os.path.exists(journal):
+                if os.path.exists(journal + ".old"):
+                    self.__end_line(journal + ".old")
+                    with open(journal, 'r') as src, \
+                            open(journal + ".old", 'a') as dst:
+                        dst.write(src.read())
+                        self.__sync(dst)
+                    os.remove(journal)
+                else:
+                    os.replace(journal, journal + ".old")
+            FileStorage.__journal_size = 0
+            objects = self.__snapshot()
+        try:
+            self.__dump(objects)
+            if os.path.exists(journal + ".old"):
+                os.remove(journal + ".old")
+            FileStorage.__signature = self.__stat()
+        finally:
+            FileStorage.__compacting = False
+
+    def __compact_shared(self, journal):
+        """
+        compacts while holding the lock file: the snapshot gets every
+        record, then the journal starts over at the next generation, which
+        tells the other processes to reload
+        """
+        with self.__locked(True), self.__lock:
+            FileStorage.__compacting = True
+            self.__catch_up()
+            self.__dump(self.__snapshot())
+            generation = self.__generation + 1
+            folder = os.path.dirname(os.path.abspath(journal))
+            fd, tmp = tempfile.mkstemp(dir=folder, prefix=".file.json.")
+            try:
+                os.chmod(tmp, 0o644)
+                with os.fdopen(fd, 'w') as f:
+                    f.write(self.__header(generation))
+                    self.__sync(f)
+                    f.flush()
+                    st = os.fstat(f.fileno())
+                os.replace(tmp, journal)
+            except BaseException:
+                os.remove(tmp)
+                raise
+            FileStorage.__generation = generation
+            FileStorage.__journal_pos = (st.st_ino, st.st_size)
+            FileStorage.__journal_size = 0
+            FileStorage.__signature = self.__stat()
+
+    def __catch_up(self):
+        """
+        applies the journal records other processes appended since this
+        one last read or wrote the journal, or reloads everything once a
+        compaction started a new generation; returns False when there was
+        nothing new
+        """
+        journal = self.__file_path + ".journal"
+        try:
+            st = os.stat(journal)
+        except FileNotFoundError:
+            return False
+        ino, offset = self.__journal_pos
+        if (st.st_ino, st.st_size) == (ino, offset):
+            return False
+        with open(journal, 'rb') as f:
+            try:
+                tag, generation = json.loads(f.readline())
+            except ValueError:
+                tag = generation = None
+        if (tag != "#generation" or generation != self.__generation or
+                ino not in (None, st.st_ino)):
+            self.reload()
+            return True
+        with self.__lock:
+            FileStorage.__journal_pos = (st.st_ino,
+                                         self.__replay(journal, offset))
+            FileStorage.__catch_ups += 1
+        return True
+
+    def __pend(self, key, record):
+        """replaces the object stored under key by a pending record"""
+        self.__unregister(key)
+        self.__pending.setdefault(key.partition('.')[0], {})[key] = record
+
+    def __replay(self, path, offset=0):
+        """
+        applies the records of the journal at path, from byte offset on,
+        to __objects, except those of keys changed here and not saved yet,
+        and of torn lines a crash left unfinished; returns the offset
+        after the last complete line
+        """
+        names = set()
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # the rest of a torn write, ended by __end_line()
+                    continue
+                if record[0] == "#generation":
+                    FileStorage.__generation = record[1]
+                elif record[0] in self.__dirty:
+                    continue
+                elif len(record) == 1:
+                    self.__unregister(record[0])
+                    names.add(record[0].partition('.')[0])
+                else:
+                    self.__pend(record[0], record[1])
+                    names.add(record[0].partition('.')[0])
+        for name in names:
+            self.__bump(name)
+        return offset
+
+    def __footer(self, f):
+        """
+        returns the checksum footer line ending the binary file f, if
+        any, after checking it matches the data before it
+        """
+        size = os.fstat(f.fileno()).st_size
+        if size < 17:
+            return None
+        f.seek(size - 17)
+        footer = f.read()
+        if not (footer.startswith(b"\n#crc32:") and footer.endswith(b"\n")):
+            return None
+        f.seek(0)
+        crc = 0
+        left = size - 17
+        while left:
+            chunk = f.read(min(left, 1 << 20))
+            crc = zlib.crc32(chunk, crc)
+            left -= len(chunk)
+        if footer.strip() != "#crc32:{:08x}".format(crc).encode():
+            raise ValueError("{}: checksum mismatch".format(
+                self.__file_path))
+        return footer
+
+    def __load(self):
+        """
+        yields the (key, dictionary) pairs stored in __file_path one at a
+        time, after checking its checksum footer if any; raises ValueError
+        if the file is corrupt
+        """
+        try:
+            f = open(self.__file_path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            footer = self.__footer(f)
+            f.seek(0)
+            codec = detect(f.read(64), self.__codec())
+            f.seek(0)
+            if self.__mmap and hasattr(codec, "index") and \
+                    os.fstat(f.fileno()).st_size:
+                records = codec.index(mmap.mmap(f.fileno(), 0,
+                                                access=mmap.ACCESS_READ))
+            else:
+                records = codec.load(f)
+            try:
+                rest = yield from records
+            except ValueError:
+                raise ValueError("{}: not a valid snapshot".format(
+                    self.__file_path))
+            if rest.strip() and (footer is None or
+                                 rest.strip() != footer.strip()):
+                raise ValueError("{}: checksum mismatch".format(
+                    self.__file_path))
+
+    def __stat(self):
+        """
+        returns the (inode, size, mtime) of the snapshot and journal files,
+        None for the missing ones
+        """
+        signature = []
+        journal = self.__file_path + ".journal"
+        for path in (self.__file_path, journal, journal + ".old"):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                signature.append(None)
+            else:
+                signature.append((st.st_ino, st.st_size, st.st_mtime_ns))
+        return tuple(signature)
+
+    def reload(self):
+        """
+        deserializes the JSON file to __objects; in lazy mode the records
+        only become objects when their class or key is first accessed;
+        in the shared mode, the objects deleted from the files meanwhile
+        are dropped as well
+        """
+        with self.__locked(False), self.__batched():
+            FileStorage.__signature = self.__stat()
+            FileStorage.__reloads += 1
+            records = list(self.__load())
+            with self.__lock:
+                if self.__shared:
+                    keys = list(self.__objects)
+                    for pending in self.__pending.values():
+                        keys.extend(pending)
+                    for key in keys:
+                        if key not in self.__dirty:
+                            self.__unregister(key)
+                for key, record in records:
+                    if key not in self.__dirty:
+                        self.__pend(key, record)
+                for name in classes:
+                    self.__bump(name)
+                if self.__journal:
+                    self.__replay_journal()
+        if not self.__lazy:
+            self.__materialize()
+
+    def __replay_journal(self):
+        """replays the journal files and remembers where they end"""
+        journal = self.__file_path + ".journal"
+        if os.path.exists(journal + ".old"):
+            self.__replay(journal + ".old")
+        try:
+            ino = os.stat(journal).st_ino
+        except FileNotFoundError:
+            FileStorage.__journal_pos = (None, 0)
+        else:
+            FileStorage.__journal_pos = (ino, self.__replay(journal))
+
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
-
-   def get(self, cls, id):
-       """
-       fetches one object, using classname and id
-       """
-       all_class = self.all(cls)
-       for obj in all_class.values():
-           if id == str(obj.id):
-               return obj
-       return None
-                      
-   def count(self, cls=None):
-        """
-            returns count of all obj in storage
-        """
-        return (len(self.all(cls)))
-   
+            if (key in self.__objects or
+                    key in self.__pending.get(obj.__class__.__name__, ())):
+                self.__unregister(key)
+                self.__bump(obj.__class__.__name__)
+                if self.__journal:
+                    self.__dirty[key] = None
+
+    def get(self, cls, id, load=None):
+        """
+        returns the object based on the class (or class name) and its ID,
+        or None if not found; load is as in all()
+        """
+        if cls is None or id is None:
+            return None
+        name = self._class_name(cls)
+        key = name + '.' + str(id)
+        if key not in self.__objects and key in self.__pending.get(name, ()):
+            with self.__lock:
+                record = self.__unpend(key)
+                if record is not None:
+                    self.__register(key, self.__build(record))
+        if load and key in self.__objects:
+            self.__load_related(name, load)
+        return self.__objects.get(key)
+
+    def get_many(self, cls, ids, load=None):
+        """
+        returns the objects of class cls (or class name) whose ID is in
+        ids, once each and in the order of ids, leaving out those not
+        found; load is as in all()
+        """
+        name = self._class_name(cls)
+        keys = [name + '.' + str(id) for id in dict.fromkeys(ids)
+                if id is not None]
+        pending = self.__pending.get(name, ())
+        if any(key not in self.__objects and key in pending for key in keys):
+            with self.__lock:
+                for key in keys:
+                    if key not in self.__objects:
+                        record = self.__unpend(key)
+                        if record is not None:
+                            self.__register(key, self.__build(record))
+        objs = [obj for obj in map(self.__objects.get, keys)
+                if obj is not None]
+        if load and objs:
+            self.__load_related(name, load)
+        return objs
+
+    def find(self, cls, **criteria):
+        """
+        returns the list of objects of class cls whose attributes equal
+        criteria, looked up in an index when one exists
+        """
+        name = self._class_name(cls)
+        self.__materialize(name)
+        indexes = self.__indexes.get(name, {})
+        found = None
+        for attr, value in criteria.items():
+            if attr in indexes:
+                found = indexes[attr].find(value)
+                break
+        if found is None:
+            found = self.__by_class.get(name, {}).values()
+        return [obj for obj in found
+                if all(getattr(obj, attr, None) == value
+                       for attr, value in criteria.items())]
+
+    def create_index(self, cls, attr, kind="hash"):
+        """
+        indexes the objects of class cls on attribute attr, with a hash
+        index (equality lookups) or a sorted one (equality and ranges)
+        """
+        kinds = {"hash": HashIndex, "sorted": SortedIndex}
+        if kind not in kinds:
+            raise ValueError("unknown index kind: {}".format(kind))
+        name = self._class_name(cls)
+        self.__materialize(name)
+        indexes = self.__indexes.setdefault(name, {})
+        if isinstance(indexes.get(attr), kinds[kind]):
+            return
+        if kind == "hash":
+            index = HashIndex(attr, "created_at")
+        else:
+            index = SortedIndex(attr)
+        for key, obj in self.__by_class.get(name, {}).items():
+            index.add(key, obj)
+        indexes[attr] = index
+
+    def range(self, cls, attr, lo=None, hi=None):
+        """
+        returns the objects of class cls whose attribute attr is between
+        lo and hi (both included, None meaning unbounded), sorted on attr
+        """
+        name = self._class_name(cls)
+        self.__materialize(name)
+        index = self.__indexes.get(name, {}).get(attr)
+        if isinstance(index, SortedIndex):
+            return index.range(lo, hi)
+        found = [obj for obj in self.all(cls).values()
+                 if getattr(obj, attr, None) is not None and
+                 (lo is None or lo <= getattr(obj, attr)) and
+                 (hi is None or getattr(obj, attr) <= hi)]
+        return sorted(found, key=lambda obj: getattr(obj, attr))
+
+    def page(self, cls, after=None, limit=100, where=None):
+        """
+        returns up to limit objects of class cls whose attributes equal
+        where, ordered by (created_at, id) and starting after the pair
+        after; walks a sorted index on created_at, or when where names an
+        attribute with a hash index, the sorted pairs of its bucket, so
+        only the objects of the page and those where leaves out are read
+        """
+        name = self._class_name(cls)
+        where = where or {}
+        self.create_index(name, "created_at", "sorted")
+        indexes = self.__indexes[name]
+        start = None if after is None else (after[0], name + '.' + after[1])
+        entries = indexes["created_at"].entries
+        objects = indexes["created_at"].objects
+        for attr, value in where.items():
+            if isinstance(indexes.get(attr), HashIndex):
+                entries = indexes[attr].ordered.get(value, [])
+                objects = indexes[attr].buckets.get(value, {})
+                break
+        pos = 0 if start is None else bisect.bisect_right(entries, start)
+        page = []
+        while pos < len(entries) and len(page) < limit:
+            obj = objects[entries[pos][1]]
+            if all(getattr(obj, attr, None) == value
+                   for attr, value in where.items()):
+                page.append(obj)
+            pos += 1
+        return page
+
+    def count(self, cls=None):
+        """
+        count the number of objects in storage, or of class cls only
+        """
+        if cls is not None:
+            name = self._class_name(cls)
+            return (len(self.__by_class.get(name, ())) +
+                    len(self.__pending.get(name, ())))
+        return (len(self.__objects) +
+                sum(len(records) for records in self.__pending.values()))
+
+    def count_many(self, cls_list):
+        """
+        returns the number of objects of each class (or class name) of
+        cls_list, by class name
+        """
+        return {self._class_name(cls): self.count(cls) for cls in cls_list}
+
+    def metrics(self):
+        """returns the reload counters of the storage"""
+        return {"reloads": self.__reloads,
+                "reloads_skipped": self.__reloads_skipped,
+                "catch_ups": self.__catch_ups}
+
     def close(self):
         """
-        call reload() method for deserializing the JSON file to objects
+        flush pending saves, then call reload() method for deserializing
+        the JSON file to objects, unless no file changed since this
+        process last read or wrote them; in the shared mode, only the
+        journal records appended by other processes are applied
         """
+        self.flush_pending()
+        if self.__shared:
+            with self.__locked(False), self.__lock:
+                if not self.__catch_up():
+                    FileStorage.__reloads_skipped += 1
+            return
+        if self.__signature is not None and \
+                self.__signature == self.__stat():
+            FileStorage.__reloads_skipped += 1
+            return
         self.reload()
@@ -0,0 +1,121 @@
+#!/usr/bin/python3
+"""
+Contains the GroupCommit class
+"""
+
+from abc import ABC, abstractmethod
+import atexit
+from contextlib import contextmanager
+from os import getenv
+import threading
+import time
+
+
+class GroupState:
+    """the saves pending a group commit, and the depth of transaction()"""
+
+    def __init__(self):
+        """Instantiate a state without pending saves"""
+        self.pending = 0
+        self.first_pending = None
+        self.depth = 0
+
+
+class GroupCommit(ABC):
+    """
+    makes save() coalesce into fewer flush() calls, once more than
+    group_ops saves are pending or group_window seconds after the first
+    one; both are off (0) by default so that save() flushes right away
+    """
+    # float - seconds a save may wait for others before being flushed
+    group_window = float(getenv("HBNB_GROUP_COMMIT_WINDOW", "0"))
+    # integer - pending saves that trigger a flush
+    group_ops = int(getenv("HBNB_GROUP_COMMIT_OPS", "0"))
+    # boolean - whether a timer thread flushes when the window expires
+    group_timer = True
+
+    _state = None
+    _timer = None
+    _atexit = False
+    _group_lock = threading.RLock()
+
+    @abstractmethod
+    def flush(self):
+        """writes every change to the underlying storage"""
+
+    def rollback(self):
+        """drops the pending changes, where the engine is able to"""
+
+    def _group_state(self):
+        """
+        returns the GroupState of the saves to group: one per engine, which
+        engines whose changes are not shared override, one per session
+        """
+        if self._state is None:
+            self._state = GroupState()
+        return self._state
+
+    def save(self):
+        """flushes the changes now, or defers them to a group commit"""
+        with self._group_lock:
+            state = self._group_state()
+            if not (state.depth or self.group_window or self.group_ops):
+                self.flush()
+                return
+            state.pending += 1
+            now = time.monotonic()
+            if state.first_pending is None:
+                state.first_pending = now
+            if not self._atexit:
+                self._atexit = True
+                atexit.register(self.flush_pending)
+            if state.depth:
+                return
+            if (self.group_ops and state.pending >= self.group_ops or
+                    self.group_window and
+                    now - state.first_pending >= self.group_window):
+                self.flush_pending()
+            elif self.group_window and self.group_timer and not self._timer:
+                self._timer = threading.Timer(self.group_window,
+                                              self.flush_pending)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush_pending(self):
+        """flushes the deferred saves, if any"""
+        with self._group_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            state = self._group_state()
+            if not state.pending:
+                return
+            state.pending = 0
+            state.first_pending = None
+            self.flush()
+
+    @contextmanager
+    def transaction(self):
+        """
+        defers every save() made in the block to a single flush when it
+        exits; if the block raises, nothing is flushed and the engine
+        rolls back what it can
+        """
+        with self._group_lock:
+            state = self._group_state()
+            state.depth += 1
+        try:
+            yield self
+        except BaseException:
+            with self._group_lock:
+                state.depth -= 1
+                if not state.depth:
+                    state.pending = 0
+                    state.first_pending = None
+                    self.rollback()
+            raise
+        with self._group_lock:
+            state.depth -= 1
+            if not state.depth:
+                state.pending += 1
+                self.flush_pending()
@@ -0,0 +1,162 @@
+#!/usr/bin/python3
+"""
+Contains the HashIndex and SortedIndex classes
+"""
+
+import bisect
+from operator import itemgetter
+
+
+class HashIndex:
+    """
+    maps each value of one attribute to the objects holding it; given an
+    order attribute, also keeps each bucket sorted on (order value, key)
+    so its objects can be walked from any point in that order
+    """
+
+    def __init__(self, attr, order=None):
+        """Instantiate an empty index on attribute attr"""
+        self.attr = attr
+        self.order = order
+        # dictionary - value -> {<class name>.id: obj}
+        self.buckets = {}
+        # dictionary - <class name>.id -> value it is indexed under
+        self.values = {}
+        # dictionary - value -> sorted (order value, <class name>.id)
+        # pairs of its bucket, leaving out order values that do not
+        # compare with the others
+        self.ordered = {}
+        # dictionary - <class name>.id -> order value it is sorted under
+        self.orders = {}
+
+    def add(self, key, obj):
+        """indexes obj under key, moving it if its value changed"""
+        value = getattr(obj, self.attr, None)
+        try:
+            hash(value)
+        except TypeError:
+            self.remove(key)
+            return
+        order = None if self.order is None else getattr(obj, self.order,
+                                                        None)
+        if key in self.values:
+            if self.values[key] == value and self.orders.get(key) == order:
+                self.buckets[value][key] = obj
+                return
+            self.remove(key)
+        self.values[key] = value
+        self.buckets.setdefault(value, {})[key] = obj
+        if self.order is not None:
+            self.orders[key] = order
+            entries = self.ordered.setdefault(value, [])
+            try:
+                bisect.insort(entries, (order, key))
+            except TypeError:
+                pass
+
+    def remove(self, key):
+        """drops key from the index"""
+        if key in self.values:
+            value = self.values.pop(key)
+            bucket = self.buckets[value]
+            del bucket[key]
+            if not bucket:
+                del self.buckets[value]
+            if self.order is not None:
+                self.__unorder(value, (self.orders.pop(key), key))
+
+    def __unorder(self, value, entry):
+        """drops entry from the sorted pairs of the bucket of value"""
+        entries = self.ordered[value]
+        try:
+            i = bisect.bisect_left(entries, entry)
+        except TypeError:
+            return
+        if i < len(entries) and entries[i] == entry:
+            del entries[i]
+        if not entries:
+            del self.ordered[value]
+
+    def find(self, value):
+        """returns the list of objects whose attribute equals value"""
+        return list(self.buckets.get(value, {}).values())
+
+
+class SortedIndex:
+    """
+    keeps the objects ordered by the value of one attribute; values that
+    do not compare with those already ordered are kept unordered instead,
+    found by equality but left out of ranges
+    """
+
+    def __init__(self, attr):
+        """Instantiate an empty index on attribute attr"""
+        self.attr = attr
+        # list - sorted (value, <class name>.id) pairs
+        self.entries = []
+        # dictionary - <class name>.id -> value it is indexed under
+        self.values = {}
+        # dictionary - <class name>.id -> obj
+        self.objects = {}
+        # dictionary - objects whose value is None, by <class name>.id
+        self.missing = {}
+        # dictionary - objects whose value does not compare with those of
+        # entries, by <class name>.id
+        self.unordered = {}
+
+    def add(self, key, obj):
+        """indexes obj under key, moving it if its value changed"""
+        value = getattr(obj, self.attr, None)
+        if key in self.objects:
+            if key in self.missing:
+                same = value is None
+            else:
+                same = self.values[key] == value
+            if same:
+                self.objects[key] = obj
+                if value is None:
+                    self.missing[key] = obj
+                return
+            self.remove(key)
+        self.objects[key] = obj
+        if value is None:
+            self.missing[key] = obj
+            return
+        self.values[key] = value
+        try:
+            bisect.insort(self.entries, (value, key))
+        except TypeError:
+            self.unordered[key] = obj
+
+    def remove(self, key):
+        """drops key from the index"""
+        if key not in self.objects:
+            return
+        del self.objects[key]
+        value = self.values.pop(key, None)
+        if (self.missing.pop(key, None) is None and
+                self.unordered.pop(key, None) is None):
+            del self.entries[bisect.bisect_left(self.entries, (value, key))]
+
+    def range(self, lo=None, hi=None):
+        """
+        returns the objects whose value is between lo and hi (both
+        included, None meaning unbounded), ordered by that value; raises
+        TypeError if lo or hi does not compare with the ordered values
+        """
+        start = 0 if lo is None else bisect.bisect_left(self.entries, (lo,))
+        end = len(self.entries)
+        if hi is not None:
+            end = bisect.bisect_right(self.entries, hi, key=itemgetter(0))
+        return [self.objects[key] for value, key in self.entries[start:end]]
+
+    def find(self, value):
+        """returns the list of objects whose attribute equals value"""
+        if value is None:
+            return list(self.missing.values())
+        found = [obj for key, obj in self.unordered.items()
+                 if self.values[key] == value]
+        try:
+            return self.range(value, value) + found
+        except TypeError:
+            return found
@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+"""
+Contains the ObjectReader class
+"""
+
+import json
+from json.decoder import WHITESPACE
+
+
+class ObjectReader:
+    """
+    reads the members of the JSON object stored in a text file one at a
+    time, so that the whole document never sits in memory
+    """
+
+    def __init__(self, f, chunk_size=1 << 16):
+        """Instantiate a reader of the JSON object in the text file f"""
+        self.f = f
+        self.chunk_size = chunk_size
+        # string - what follows the object in the file, once it is read
+        self.tail = None
+        self.__decoder = json.JSONDecoder()
+        self.__buf = ""
+        self.__eof = False
+
+    def __more(self, pos):
+        """
+        drops the consumed text before pos from the buffer and reads the
+        next chunk; returns the new position, or raises ValueError at EOF
+        """
+        if self.__eof:
+            raise ValueError("unexpected end of JSON document")
+        chunk = self.f.read(self.chunk_size)
+        self.__buf = self.__buf[pos:] + chunk
+        self.__eof = not chunk
+        return 0
+
+    def __skip(self, pos, expected=None):
+        """
+        returns the position of the next character that is not
+        whitespace, after checking it is expected if given
+        """
+        while True:
+            pos = WHITESPACE.match(self.__buf, pos).end()
+            if pos < len(self.__buf):
+                break
+            pos = self.__more(pos)
+        if expected is not None and self.__buf[pos] not in expected:
+            raise ValueError("expected {!r} at {!r}".format(
+                expected, self.__buf[pos:pos + 20]))
+        return pos
+
+    def __value(self, pos):
+        """decodes the JSON value at pos, returns it and its end"""
+        while True:
+            try:
+                value, end = self.__decoder.raw_decode(self.__buf, pos)
+            except ValueError:
+                if self.__eof:
+                    raise
+                pos = self.__more(pos)
+                continue
+            # a number may go on in the next chunk
+            if end < len(self.__buf) or self.__eof:
+                return value, end
+            pos = self.__more(pos)
+
+    def __iter__(self):
+        """yields the (key, value) members of the object in file order"""
+        pos = self.__skip(0, "{") + 1
+        pos = self.__skip(pos)
+        if self.__buf[pos] != "}":
+            while True:
+                key, pos = self.__value(self.__skip(pos, '"'))
+                pos = self.__skip(pos, ":") + 1
+                value, pos = self.__value(self.__skip(pos))
+                yield key, value
+                pos = self.__skip(pos, ",}")
+                if self.__buf[pos] == "}":
+                    break
+                pos += 1
+        self.tail = self.__buf[pos + 1:] + self.f.read()
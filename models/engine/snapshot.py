@@ -0,0 +1,257 @@
+#!/usr/bin/python3
+"""
+Contains the codecs FileStorage writes its snapshots with
+"""
+
+import io
+import json
+import marshal
+from models.engine.json_stream import ObjectReader
+import pickle
+import struct
+import zlib
+
+
+class MappedRecord:
+    """a record still encoded in JSON in a buffer such as an mmap"""
+    __slots__ = ("data", "start", "end")
+
+    def __init__(self, data, start, end):
+        """Instantiate the record held by data[start:end]"""
+        self.data = data
+        self.start = start
+        self.end = end
+
+    def text(self):
+        """returns the JSON text of the record"""
+        return self.data[self.start:self.end].decode()
+
+    def load(self):
+        """returns the decoded record"""
+        return json.loads(self.data[self.start:self.end])
+
+
+def to_json(obj):
+    """returns the JSON text of a model or of a plain or mapped record"""
+    if isinstance(obj, dict):
+        return json.dumps(obj)
+    if isinstance(obj, MappedRecord):
+        return obj.text()
+    return obj.to_json_string()
+
+
+def to_record(obj):
+    """returns the dictionary of a model or of a plain or mapped record"""
+    if isinstance(obj, dict):
+        return obj
+    if isinstance(obj, MappedRecord):
+        return obj.load()
+    return obj.to_dict()
+
+
+class ChecksumWriter:
+    """forwards writes to a binary file, keeping the crc32 of the data"""
+
+    def __init__(self, f):
+        """Instantiate a writer to the binary file f"""
+        self.f = f
+        self.crc = 0
+
+    def write(self, data):
+        """writes data to the file and adds it to the crc32"""
+        self.crc = zlib.crc32(data, self.crc)
+        return self.f.write(data)
+
+
+class JsonCodec:
+    """one JSON object mapping <class name>.id to records"""
+    name = "json"
+    magic = None
+
+    def dump(self, items, f):
+        """writes the (key, obj) pairs of items to the binary file f"""
+        f.write(b"{")
+        sep = ""
+        for key, obj in items:
+            f.write((sep + json.dumps(key) + ": " + to_json(obj)).encode())
+            sep = ", "
+        f.write(b"}")
+
+    def load(self, f):
+        """
+        yields the (key, record) pairs stored in the binary file f and
+        returns what follows them
+        """
+        reader = ObjectReader(io.TextIOWrapper(f, encoding="utf-8"))
+        yield from reader
+        return reader.tail.encode()
+
+
+class JsonLinesCodec:
+    """one ["<class name>.id", record] JSON array per line"""
+    name = "jsonl"
+    magic = None
+
+    def dump(self, items, f):
+        """writes the (key, obj) pairs of items to the binary file f"""
+        for key, obj in items:
+            f.write(("[" + json.dumps(key) + ", " + to_json(obj) +
+                     "]\n").encode())
+
+    def load(self, f):
+        """
+        yields the (key, record) pairs stored in the binary file f and
+        returns what follows them
+        """
+        for line in f:
+            if line.startswith(b"#"):
+                return line + f.read()
+            if line.strip():
+                key, record = json.loads(line)
+                yield key, record
+        return b""
+
+    def index(self, data):
+        """
+        yields the (key, record) pairs of the snapshot held by the buffer
+        data without decoding the records, which are MappedRecords into
+        data, and returns what follows them
+        """
+        pos = 0
+        size = len(data)
+        while pos < size:
+            end = data.find(b"\n", pos)
+            if end < 0:
+                end = size
+            if data[pos:pos + 1] == b"#":
+                return data[pos:]
+            quote = data.find(b'"', pos + 2, end)
+            if (data[pos:pos + 2] == b'["' and quote > 0 and
+                    data[quote + 1:quote + 3] == b", " and
+                    data[end - 1:end] == b"]" and
+                    b"\\" not in data[pos + 2:quote]):
+                yield (data[pos + 2:quote].decode(),
+                       MappedRecord(data, quote + 3, end - 1))
+            elif data[pos:end].strip():
+                key, record = json.loads(data[pos:end])
+                yield key, record
+            pos = end + 1
+        return b""
+
+
+class PickleCodec:
+    """batches of (key, record) pairs pickled with protocol 5"""
+    name = "pickle"
+    magic = b"#hbnb-pickle-5\n"
+    batch = 1024
+
+    class Unpickler(pickle.Unpickler):
+        """unpickles plain data only, never imports a global"""
+
+        def find_class(self, module, name):
+            """refuses every global"""
+            raise pickle.UnpicklingError(
+                "global {}.{} in snapshot".format(module, name))
+
+    def dump(self, items, f):
+        """writes the (key, obj) pairs of items to the binary file f"""
+        f.write(self.magic)
+        batch = []
+        for key, obj in items:
+            batch.append((key, to_record(obj)))
+            if len(batch) == self.batch:
+                pickle.dump(batch, f, protocol=5)
+                batch = []
+        if batch:
+            pickle.dump(batch, f, protocol=5)
+        pickle.dump(None, f, protocol=5)
+
+    def load(self, f):
+        """
+        yields the (key, record) pairs stored in the binary file f and
+        returns what follows them
+        """
+        if f.read(len(self.magic)) != self.magic:
+            raise ValueError("not a pickle snapshot")
+        unpickler = self.Unpickler(f)
+        while True:
+            try:
+                batch = unpickler.load()
+            except (EOFError, pickle.UnpicklingError, TypeError) as e:
+                raise ValueError(str(e))
+            if batch is None:
+                return f.read()
+            yield from batch
+
+
+class MarshalCodec:
+    """
+    batches of (key, record) pairs in the marshal format, each preceded
+    by its length as a 32-bit little-endian integer; length 0 ends them
+    """
+    name = "marshal"
+    magic = b"#hbnb-marshal-4\n"
+    batch = 1024
+    length = struct.Struct("<I")
+
+    def __write(self, batch, f):
+        """writes one batch to the binary file f"""
+        data = marshal.dumps(batch, 4)
+        f.write(self.length.pack(len(data)))
+        f.write(data)
+
+    def dump(self, items, f):
+        """writes the (key, obj) pairs of items to the binary file f"""
+        f.write(self.magic)
+        batch = []
+        for key, obj in items:
+            batch.append((key, to_record(obj)))
+            if len(batch) == self.batch:
+                self.__write(batch, f)
+                batch = []
+        if batch:
+            self.__write(batch, f)
+        f.write(self.length.pack(0))
+
+    def load(self, f):
+        """
+        yields the (key, record) pairs stored in the binary file f and
+        returns what follows them
+        """
+        if f.read(len(self.magic)) != self.magic:
+            raise ValueError("not a marshal snapshot")
+        while True:
+            head = f.read(self.length.size)
+            if len(head) < self.length.size:
+                raise ValueError("truncated marshal snapshot")
+            size = self.length.unpack(head)[0]
+            if not size:
+                return f.read()
+            data = f.read(size)
+            if len(data) < size:
+                raise ValueError("truncated marshal snapshot")
+            try:
+                batch = marshal.loads(data)
+            except (EOFError, TypeError) as e:
+                raise ValueError(str(e))
+            yield from batch
+
+
+CODECS = {codec.name: codec() for codec in
+          (JsonCodec, JsonLinesCodec, PickleCodec, MarshalCodec)}
+
+
+def detect(head, default):
+    """
+    returns the codec that wrote a snapshot starting with the bytes
+    head, or default when head does not tell
+    """
+    for codec in CODECS.values():
+        if codec.magic is not None and head.startswith(codec.magic):
+            return codec
+    first = head.lstrip()[:1]
+    if first == b"{":
+        return CODECS["json"]
+    if first == b"[":
+        return CODECS["jsonl"]
+    return default
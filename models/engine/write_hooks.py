@@ -0,0 +1,25 @@
+#!/usr/bin/python3
+"""
+Contains the WriteHooks class
+"""
+
+
+class WriteHooks:
+    """
+    calls the functions registered with on_write() with the names of the
+    classes whose objects were written, once the writes are visible to
+    the other readers of the storage
+    """
+    # list - the registered functions, shared by every engine
+    _write_hooks = []
+
+    def on_write(self, hook):
+        """registers hook, called with a set of class names, and returns it"""
+        self._write_hooks.append(hook)
+        return hook
+
+    def _written(self, names):
+        """calls every registered function with names, if not empty"""
+        if names:
+            for hook in list(self._write_hooks):
+                hook(names)
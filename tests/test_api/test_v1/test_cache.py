@@ -0,0 +1,173 @@
+#!/usr/bin/python3
+"""
+Contains the TestCacheDocs, TestLRUCache and TestSocketCache classes
+"""
+
+from api.v1 import cache
+import inspect
+import os
+import pep8
+import tempfile
+import threading
+import time
+import unittest
+LRUCache = cache.LRUCache
+SocketCache = cache.SocketCache
+CacheServer = cache.CacheServer
+
+
+class TestCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of cache"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.classes = [LRUCache, SocketCache, CacheServer]
+
+    def test_pep8_conformance_cache(self):
+        """Test that api/v1/cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_cache(self):
+        """Test tests/test_api/test_v1/test_cache.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cache_module_docstring(self):
+        """Test for the cache.py module docstring"""
+        self.assertIsNot(cache.__doc__, None,
+                         "cache.py needs a docstring")
+        self.assertTrue(len(cache.__doc__) >= 1,
+                        "cache.py needs a docstring")
+
+    def test_class_docstrings(self):
+        """Test for the docstrings of the classes and their methods"""
+        for cls in self.classes:
+            self.assertTrue(cls.__doc__, "{} needs a docstring".format(
+                cls.__name__))
+            for name, func in inspect.getmembers(cls, inspect.isfunction):
+                self.assertTrue(func.__doc__,
+                                "{}.{} needs a docstring".format(
+                                    cls.__name__, name))
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test the in-process cache"""
+
+    def test_get_set(self):
+        """Test that values are returned until their ttl runs out"""
+        lru = LRUCache(maxsize=10, ttl=0.05)
+        value, epoch = lru.get("a")
+        self.assertIsNone(value)
+        lru.set("a", 1, ["State"], epoch)
+        self.assertEqual(lru.get("a")[0], 1)
+        time.sleep(0.06)
+        self.assertIsNone(lru.get("a")[0])
+        self.assertEqual(lru.stats()["size"], 0)
+        self.assertEqual((lru.stats()["hits"], lru.stats()["misses"]),
+                         (1, 2))
+
+    def test_least_recently_used(self):
+        """Test that the least recently used entry is dropped first"""
+        lru = LRUCache(maxsize=2)
+        for key in "ab":
+            lru.set(key, key, [], lru.get(key)[1])
+        lru.get("a")
+        lru.set("c", "c", [], lru.epoch)
+        self.assertEqual(list(lru.entries), ["a", "c"])
+
+    def test_invalidate(self):
+        """Test that invalidate drops the entries of the classes only"""
+        lru = LRUCache()
+        lru.set("states", 1, ["State"], 0)
+        lru.set("cities", 2, ["City", "State"], 0)
+        lru.set("amenities", 3, ["Amenity"], 0)
+        lru.invalidate(["City"])
+        self.assertEqual(sorted(lru.entries), ["amenities", "states"])
+        self.assertEqual(lru.keys, {"State": {"states"},
+                                    "Amenity": {"amenities"}})
+        lru.invalidate({"State", "Amenity"})
+        self.assertEqual((lru.entries, lru.keys), ({}, {}))
+
+    def test_set_after_invalidate(self):
+        """Test that a value computed before an invalidation is ignored"""
+        lru = LRUCache()
+        value, epoch = lru.get("states")
+        lru.invalidate(["State"])
+        lru.set("states", "stale", ["State"], epoch)
+        lru.set("amenities", "fresh", ["Amenity"], epoch)
+        self.assertEqual(list(lru.entries), ["amenities"])
+        lru.clear()
+        lru.set("amenities", "stale", ["Amenity"], epoch)
+        self.assertEqual(lru.stats()["size"], 0)
+
+
+class TestSocketCache(unittest.TestCase):
+    """Test the cache shared on a local socket"""
+
+    def setUp(self):
+        """Serve a cache on a socket in a temporary directory"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.address = os.path.join(self.tmp.name, "cache.sock")
+        self.server = CacheServer(self.address, authkey=b"test")
+        threading.Thread(target=self.server.serve_forever,
+                         daemon=True).start()
+
+    def tearDown(self):
+        """Stop the server"""
+        self.server.close()
+        self.tmp.cleanup()
+
+    def test_shared(self):
+        """Test that two clients share the entries and invalidations"""
+        one = SocketCache(self.address, authkey=b"test")
+        two = SocketCache(self.address, authkey=b"test")
+        value, epoch = one.get("states")
+        self.assertIsNone(value)
+        one.set("states", {"body": b"[]"}, ("State",), epoch)
+        self.assertEqual(two.get("states")[0], {"body": b"[]"})
+        two.invalidate({"State"})
+        self.assertIsNone(one.get("states")[0])
+        one.set("states", "stale", ("State",), epoch)
+        self.assertIsNone(two.get("states")[0])
+        self.assertEqual(one.stats()["invalidations"], 1)
+
+    def test_unreachable(self):
+        """Test that a cache nobody serves always misses"""
+        lost = SocketCache(os.path.join(self.tmp.name, "none.sock"),
+                           authkey=b"test")
+        self.assertEqual(lost.get("states"), (None, None))
+        lost.set("states", 1, ("State",), None)
+        lost.invalidate({"State"})
+        self.assertEqual(lost.stats(), {})
+
+    def test_refused(self):
+        """Test that a missing key or a shared directory is refused"""
+        for authkey in (None, b""):
+            with self.assertRaises(ValueError):
+                SocketCache(self.address, authkey=authkey)
+            with self.assertRaises(ValueError):
+                CacheServer(os.path.join(self.tmp.name, "other.sock"),
+                            authkey=authkey)
+        os.chmod(self.tmp.name, 0o755)
+        with self.assertRaises(PermissionError):
+            SocketCache(self.address, authkey=b"test")
+        with self.assertRaises(PermissionError):
+            CacheServer(os.path.join(self.tmp.name, "other.sock"),
+                        authkey=b"test")
+
+    def test_private_directory(self):
+        """Test that the server creates a missing directory for the user"""
+        address = os.path.join(self.tmp.name, "run", "cache.sock")
+        server = CacheServer(address, authkey=b"test")
+        server.close()
+        mode = os.stat(os.path.dirname(address)).st_mode
+        self.assertEqual(mode & 0o777, 0o700)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+"""
+Contains the TestBatchDocs and TestBatch classes
+"""
+
+from api.v1.app import app
+from api.v1.views import batch
+import inspect
+from models.state import State
+from models.user import User
+import pep8
+from tests.test_models.test_engine.test_file_storage import \
+    TempFileStorageCase
+import unittest
+
+
+class TestBatchDocs(unittest.TestCase):
+    """Tests to check the documentation and style of batch"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.funcs = inspect.getmembers(batch, inspect.isfunction)
+
+    def test_pep8_conformance_batch(self):
+        """Test that api/v1/views/batch.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/batch.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_batch(self):
+        """Test tests/test_api/test_v1/test_views/test_batch.py PEP8"""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_batch.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_batch_module_docstring(self):
+        """Test for the batch.py module docstring"""
+        self.assertIsNot(batch.__doc__, None,
+                         "batch.py needs a docstring")
+        self.assertTrue(len(batch.__doc__) >= 1,
+                        "batch.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """Test for the presence of docstrings in batch functions"""
+        for func in self.funcs:
+            if func[1].__module__ != batch.__name__:
+                continue
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+class TestBatch(TempFileStorageCase):
+    """Test the batch_get endpoints"""
+
+    def setUp(self):
+        """Save three States and a User in an empty temporary store"""
+        super().setUp()
+        self.client = app.test_client()
+        self.states = [State(name=str(i)) for i in range(3)]
+        self.user = User(email="a@b.c", password="pwd")
+        for obj in self.states + [self.user]:
+            obj.save()
+
+    def test_post(self):
+        """Test that the objects found come in the order of the ids"""
+        ids = [self.states[2].id, "missing", self.states[0].id,
+               self.states[2].id]
+        response = self.client.post("/api/v1/states/batch_get",
+                                    json={"ids": ids})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([state["id"] for state in response.json],
+                         [self.states[2].id, self.states[0].id])
+
+    def test_get(self):
+        """Test that the ids argument works like the JSON body"""
+        url = "/api/v1/users/batch_get?ids={},,missing".format(self.user.id)
+        response = self.client.get(url)
+        self.assertEqual([user["id"] for user in response.json],
+                         [self.user.id])
+        self.assertNotIn("password", response.json[0])
+        response = self.client.get("/api/v1/places/batch_get?ids=")
+        self.assertEqual(response.json, [])
+
+    def test_bad_requests(self):
+        """Test that missing, invalid or too many ids are rejected"""
+        url = "/api/v1/states/batch_get"
+        for body in ({}, {"ids": "x"}, {"ids": [1]}, [],
+                     {"ids": ["x"] * (batch.MAX_LIMIT + 1)}):
+            with self.subTest(body=body):
+                response = self.client.post(url, json=body)
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.post(url, data="x").status_code, 400)
+        self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(self.client.get(
+            "/api/v1/things/batch_get?ids=a").status_code, 404)
+
+    def test_get_user(self):
+        """Test the GET route of a single User"""
+        response = self.client.get("/api/v1/users/" + self.user.id)
+        self.assertEqual(response.json["email"], "a@b.c")
+        self.assertEqual(self.client.get(
+            "/api/v1/users/missing").status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+#!/usr/bin/python3
+"""
+Contains the TestCachingDocs and TestCaching classes
+"""
+
+from api.v1.app import app
+from api.v1.cache import LRUCache
+from api.v1.views import caching
+import inspect
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.state import State
+import pep8
+from tests.test_models.test_engine.test_file_storage import \
+    TempFileStorageCase
+import unittest
+
+
+class TestCachingDocs(unittest.TestCase):
+    """Tests to check the documentation and style of caching"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.funcs = inspect.getmembers(caching, inspect.isfunction)
+
+    def test_pep8_conformance_caching(self):
+        """Test that api/v1/views/caching.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/caching.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_caching(self):
+        """Test tests/test_api/test_v1/test_views/test_caching.py PEP8"""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_caching.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_caching_module_docstring(self):
+        """Test for the caching.py module docstring"""
+        self.assertIsNot(caching.__doc__, None,
+                         "caching.py needs a docstring")
+        self.assertTrue(len(caching.__doc__) >= 1,
+                        "caching.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """Test for the presence of docstrings in caching functions"""
+        for func in self.funcs:
+            if func[1].__module__ != caching.__name__:
+                continue
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+class TestCaching(TempFileStorageCase):
+    """Test the response cache of the read endpoints"""
+
+    def setUp(self):
+        """Plug in an empty cache and save a State with a City"""
+        super().setUp()
+        self.saved_backend = caching.backend
+        caching.backend = LRUCache()
+        self.client = app.test_client()
+        self.state = State(name="California")
+        self.state.save()
+        self.city = City(name="Fresno", state_id=self.state.id)
+        self.city.save()
+
+    def tearDown(self):
+        """Restore the cache and the store"""
+        caching.backend = self.saved_backend
+        super().tearDown()
+
+    def get(self, url, **headers):
+        """returns the response to url, its streamed body read through"""
+        response = self.client.get(url, headers=headers)
+        response.get_data()
+        return response
+
+    def test_hit(self):
+        """Test that a second request is answered from the cache"""
+        first = self.get("/api/v1/states")
+        second = self.get("/api/v1/states")
+        self.assertEqual(second.get_data(), first.get_data())
+        self.assertEqual(second.mimetype, "application/json")
+        self.assertEqual(caching.backend.stats()["hits"], 1)
+        self.assertEqual(second.headers["ETag"], first.headers["ETag"])
+
+    def test_unreported_write(self):
+        """Test that entries of another version of the class are missed"""
+        first = self.get("/api/v1/states")
+        cache = caching.backend
+        caching.backend = None
+        try:
+            nevada = State(name="Nevada")
+            nevada.save()
+        finally:
+            caching.backend = cache
+        second = self.get("/api/v1/states")
+        self.assertNotEqual(second.headers["ETag"], first.headers["ETag"])
+        self.assertIn(nevada.id, [state["id"] for state in second.json])
+
+    def test_keys(self):
+        """Test that the URL and format make different entries"""
+        self.get("/api/v1/states")
+        self.get("/api/v1/states?limit=1")
+        ndjson = self.get("/api/v1/states",
+                          Accept="application/x-ndjson")
+        self.assertEqual(ndjson.mimetype, "application/x-ndjson")
+        self.assertEqual(caching.backend.stats()["size"], 3)
+
+    def test_invalidation(self):
+        """Test that writes drop the entries of their classes only"""
+        for url in ("/api/v1/stats", "/api/v1/amenities",
+                    "/api/v1/states/{}/cities".format(self.state.id)):
+            self.get(url)
+        self.city.name = "Reno"
+        self.city.save()
+        self.assertEqual(list(caching.backend.entries),
+                         [("/api/v1/amenities?", False)])
+        cities = self.get("/api/v1/states/{}/cities".format(self.state.id))
+        self.assertEqual([city["name"] for city in cities.json], ["Reno"])
+        wifi = Amenity(name="Wifi")
+        wifi.save()
+        amenities = self.get("/api/v1/amenities")
+        self.assertIn(wifi.id, [amenity["id"] for amenity in amenities.json])
+        self.assertEqual(self.get("/api/v1/stats").json["Amenity"],
+                         models.storage.count(Amenity))
+
+    def test_errors_not_cached(self):
+        """Test that only successful responses are cached"""
+        url = "/api/v1/states/missing/cities"
+        self.assertEqual(self.get(url).status_code, 404)
+        self.assertEqual(caching.backend.stats()["size"], 0)
+
+    def test_streamed(self):
+        """Test that a streamed body is cached once sent in full"""
+        response = self.client.get("/api/v1/states")
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(caching.backend.stats()["size"], 0)
+        body = response.get_data()
+        self.assertEqual(caching.backend.stats()["size"], 1)
+        self.assertEqual(self.get("/api/v1/states").get_data(), body)
+        self.assertEqual(caching.backend.stats()["hits"], 1)
+
+    def test_streamed_closed(self):
+        """Test that a streamed body closed before its end is not cached"""
+        response = self.client.get("/api/v1/states")
+        response.close()
+        self.assertEqual(caching.backend.stats()["size"], 0)
+
+    def test_max_body(self):
+        """Test that bodies over MAX_BODY bytes are not cached"""
+        saved = caching.MAX_BODY
+        caching.MAX_BODY = 1
+        try:
+            self.get("/api/v1/states")
+            self.get("/api/v1/stats")
+        finally:
+            caching.MAX_BODY = saved
+        self.assertEqual(caching.backend.stats()["size"], 0)
+
+    def test_disabled(self):
+        """Test that the views run every time without a backend"""
+        caching.backend = None
+        self.assertEqual(self.get("/api/v1/states").status_code, 200)
+        self.assertNotIn("cache", self.get("/api/v1/metrics").json)
+
+
+if __name__ == '__main__':
+    unittest.main()
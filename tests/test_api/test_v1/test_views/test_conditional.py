@@ -0,0 +1,148 @@
+#!/usr/bin/python3
+"""
+Contains the TestConditionalDocs and TestConditional classes
+"""
+
+from api.v1.app import app
+from api.v1.views import conditional
+from datetime import datetime, timedelta
+import inspect
+from models.amenity import Amenity
+from models.state import State
+import pep8
+from tests.test_models.test_engine.test_file_storage import \
+    TempFileStorageCase
+import unittest
+
+
+class TestConditionalDocs(unittest.TestCase):
+    """Tests to check the documentation and style of conditional"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.funcs = inspect.getmembers(conditional, inspect.isfunction)
+
+    def test_pep8_conformance_conditional(self):
+        """Test that api/v1/views/conditional.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/conditional.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_conditional(self):
+        """Test tests/test_api/test_v1/test_views/test_conditional.py PEP8"""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_conditional.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_conditional_module_docstring(self):
+        """Test for the conditional.py module docstring"""
+        self.assertIsNot(conditional.__doc__, None,
+                         "conditional.py needs a docstring")
+        self.assertTrue(len(conditional.__doc__) >= 1,
+                        "conditional.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """Test for the presence of docstrings in conditional functions"""
+        for func in self.funcs:
+            if func[1].__module__ != conditional.__name__:
+                continue
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+class TestConditional(TempFileStorageCase):
+    """Test the 304 Not Modified answers of the API"""
+
+    def setUp(self):
+        """Save a State in an empty temporary store"""
+        super().setUp()
+        self.client = app.test_client()
+        self.state = State(name="California")
+        self.state.save()
+
+    def get(self, url, **headers):
+        """returns the response to url, its streamed body read through"""
+        response = self.client.get(url, headers=headers)
+        response.get_data()
+        return response
+
+    def revalidate(self, url, response, **headers):
+        """returns the response to url sent with the ETag of response"""
+        headers.setdefault("If-None-Match", response.headers["ETag"])
+        return self.get(url, **headers)
+
+    def test_list(self):
+        """Test that a list is 304 until one of its objects changes"""
+        first = self.get("/api/v1/states")
+        self.assertEqual(first.status_code, 200)
+        again = self.revalidate("/api/v1/states", first)
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.get_data(), b"")
+        self.assertEqual(again.headers["ETag"], first.headers["ETag"])
+        self.client.put("/api/v1/states/" + self.state.id,
+                        json={"name": "Nevada"})
+        changed = self.revalidate("/api/v1/states", first)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["ETag"], first.headers["ETag"])
+
+    def test_list_other_class(self):
+        """Test that writes to another class keep a list not modified"""
+        first = self.get("/api/v1/amenities")
+        State(name="Nevada").save()
+        self.assertEqual(self.revalidate("/api/v1/amenities",
+                                         first).status_code, 304)
+        Amenity(name="Wifi").save()
+        self.assertEqual(self.revalidate("/api/v1/amenities",
+                                         first).status_code, 200)
+
+    def test_list_representations(self):
+        """Test that pages and formats of a list have their own tags"""
+        first = self.get("/api/v1/states")
+        for url, headers in (("/api/v1/states?limit=1", {}),
+                             ("/api/v1/states",
+                              {"Accept": "application/x-ndjson"})):
+            with self.subTest(url=url, headers=headers):
+                response = self.revalidate(url, first, **headers)
+                self.assertEqual(response.status_code, 200)
+
+    def test_object(self):
+        """Test that an object is 304 until it is saved again"""
+        url = "/api/v1/states/" + self.state.id
+        first = self.client.get(url)
+        self.assertEqual(first.json["id"], self.state.id)
+        self.assertEqual(self.revalidate(url, first).status_code, 304)
+        self.assertEqual(self.revalidate(
+            url, first, **{"If-None-Match": "*"}).status_code, 304)
+        self.assertEqual(self.revalidate(
+            url, first, **{"If-None-Match": '"x"'}).status_code, 200)
+        self.state.save()
+        self.assertEqual(self.revalidate(url, first).status_code, 200)
+
+    def test_if_modified_since(self):
+        """Test that If-Modified-Since is honored without If-None-Match"""
+        url = "/api/v1/states/" + self.state.id
+        first = self.client.get(url)
+        since = first.headers["Last-Modified"]
+        response = self.client.get(url, headers={"If-Modified-Since": since})
+        self.assertEqual(response.status_code, 304)
+        self.state.updated_at = datetime.utcnow() + timedelta(seconds=2)
+        response = self.client.get(url, headers={"If-Modified-Since": since})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(url, headers={
+            "If-Modified-Since": since, "If-None-Match": '"x"'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_missing(self):
+        """Test that a missing object is still 404"""
+        response = self.client.get("/api/v1/states/missing",
+                                   headers={"If-None-Match": "*"})
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+#!/usr/bin/python3
+"""
+Contains the TestPaginationDocs, TestPagination and TestStreaming classes
+"""
+
+from api.v1.app import app
+from api.v1.views import pagination
+import base64
+from datetime import datetime
+import inspect
+import json
+from models.city import City
+from models.state import State
+import pep8
+from tests.test_models.test_engine.test_file_storage import \
+    TempFileStorageCase
+import unittest
+
+
+class TestPaginationDocs(unittest.TestCase):
+    """Tests to check the documentation and style of pagination"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.funcs = inspect.getmembers(pagination, inspect.isfunction)
+
+    def test_pep8_conformance_pagination(self):
+        """Test that api/v1/views/pagination.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_pagination(self):
+        """Test tests/test_api/test_v1/test_views/test_pagination.py PEP8"""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pagination_module_docstring(self):
+        """Test for the pagination.py module docstring"""
+        self.assertIsNot(pagination.__doc__, None,
+                         "pagination.py needs a docstring")
+        self.assertTrue(len(pagination.__doc__) >= 1,
+                        "pagination.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """Test for the presence of docstrings in pagination functions"""
+        for func in self.funcs:
+            if func[1].__module__ != pagination.__name__:
+                continue
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+class TestPagination(TempFileStorageCase):
+    """Test the keyset pagination of the list endpoints"""
+
+    def setUp(self):
+        """
+        Save a State with five Cities, two created at the same time, in an
+        empty temporary store
+        """
+        TempFileStorageCase.setUp(self)
+        self.client = app.test_client()
+        self.state = State(name="California")
+        self.state.save()
+        same = datetime(2017, 3, 25, 2, 17, 6)
+        self.cities = [City(name=str(i), state_id=self.state.id,
+                            created_at=same.isoformat() if i < 2 else None)
+                       for i in range(5)]
+        for city in self.cities:
+            city.save()
+        self.url = "/api/v1/states/{}/cities".format(self.state.id)
+
+    def test_pages(self):
+        """Test that following the Link headers visits every city once"""
+        url = self.url + "?limit=2"
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append([city["id"] for city in response.json])
+            link = response.headers.get("Link")
+            url = link[1:link.index(">")] if link else None
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        expected = sorted(self.cities, key=lambda c: (c.created_at, c.id))
+        self.assertEqual(sum(pages, []), [city.id for city in expected])
+
+    def test_unpaged(self):
+        """Test that without limit nor cursor every city is returned"""
+        response = self.client.get(self.url)
+        self.assertNotIn("Link", response.headers)
+        self.assertCountEqual([city["id"] for city in response.json],
+                              [city.id for city in self.cities])
+
+    def test_bad_arguments(self):
+        """Test that invalid limits and cursors are rejected"""
+        aware = base64.urlsafe_b64encode(
+            b"2020-01-01T00:00:00+00:00 abc").decode().rstrip("=")
+        for query in ("limit=0", "limit=x", "limit=100000", "cursor=%%%",
+                      "cursor=" + pagination.encode_cursor(self.state)[2:],
+                      "limit=2&cursor=" + aware):
+            with self.subTest(query=query):
+                response = self.client.get(self.url + "?" + query)
+                self.assertEqual(response.status_code, 400)
+
+
+class TestStreaming(TempFileStorageCase):
+    """Test the streamed JSON and NDJSON list responses"""
+    setUp = TestPagination.setUp
+
+    def test_streamed_array(self):
+        """Test that an unpaged list is streamed as one JSON array"""
+        response = self.client.get(self.url)
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertCountEqual([city["id"] for city in response.json],
+                              [city.id for city in self.cities])
+
+    def test_chunks(self):
+        """Test that json_chunks splits the array but keeps it valid"""
+        chunks = list(pagination.json_chunks(self.cities))
+        self.assertEqual(json.loads("".join(chunks)),
+                         [city.to_dict() for city in self.cities])
+        self.assertEqual(list(pagination.json_chunks([])), ["[]"])
+
+    def test_ndjson(self):
+        """Test that NDJSON is sent when the client accepts it"""
+        headers = {"Accept": pagination.NDJSON}
+        for query in ("", "?limit=2"):
+            with self.subTest(query=query):
+                response = self.client.get(self.url + query, headers=headers)
+                self.assertEqual(response.mimetype, pagination.NDJSON)
+                lines = response.get_data(as_text=True).splitlines()
+                ids = [json.loads(line)["id"] for line in lines]
+                self.assertEqual(len(ids), 2 if query else 5)
+                self.assertTrue(set(ids) <= {c.id for c in self.cities})
+
+    def test_ndjson_empty(self):
+        """Test that a state without cities streams no NDJSON line"""
+        state = State(name="Empty")
+        state.save()
+        response = self.client.get(
+            "/api/v1/states/{}/cities".format(state.id),
+            headers={"Accept": pagination.NDJSON})
+        self.assertEqual(response.get_data(as_text=True), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,8 +2,12 @@
 """Test BaseModel for expected behavior and documentation"""
 from datetime import datetime
 import inspect
+import json
 import models
+import os
 import pep8 as pycodestyle
+import subprocess
+import sys
 import time
 import unittest
 from unittest import mock
@@ -138,6 +142,79 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(new_d["created_at"], bm.created_at.strftime(t_format))
         self.assertEqual(new_d["updated_at"], bm.updated_at.strftime(t_format))
 
+    def test_kwargs_times(self):
+        """Test that to_dict times are read back, with or without micros"""
+        for stamp in ("2017-09-28T21:03:54.052298", "2017-09-28T21:03:54",
+                      "2017-09-28T21:03:54.5"):
+            with self.subTest(stamp=stamp):
+                inst = BaseModel(created_at=stamp, updated_at=stamp)
+                self.assertIs(type(inst.created_at), datetime)
+                clone = BaseModel(**inst.to_dict())
+                self.assertEqual(clone.created_at, inst.created_at)
+                self.assertEqual(inst.to_dict()["created_at"],
+                                 inst.created_at.isoformat())
+
+    def test_kwargs_times_invalid(self):
+        """Test that times with an offset or another shape are rejected"""
+        for stamp in ("2017-09-28T21:03:54+00:00", "2017-09-28T21:03:54Z",
+                      "2017-09-28T21:03:54.052298+02:00", "2017-09-28",
+                      "2017-09-28 21:03:54.052298"):
+            with self.subTest(stamp=stamp):
+                with self.assertRaises(ValueError):
+                    BaseModel(created_at=stamp)
+
+    @unittest.skipIf(models.base_model.compact, "no time cache")
+    def test_to_dict_time_cache(self):
+        """Test that cached time strings follow attribute changes"""
+        inst = BaseModel()
+        first = inst.to_dict()["updated_at"]
+        self.assertIs(inst.to_dict()["updated_at"], first)
+        inst.updated_at = datetime(2020, 1, 2, 3, 4, 5)
+        self.assertEqual(inst.to_dict()["updated_at"], "2020-01-02T03:04:05")
+        self.assertNotIn("_BaseModel__iso", inst.to_dict())
+
+    @unittest.skipIf(not models.base_model.cached, "no to_dict cache")
+    def test_to_dict_cache(self):
+        """Test that to_dict and to_json_string follow every change"""
+        inst = BaseModel()
+        inst.tags = ["a"]
+        first = inst.to_dict()
+        first["name"] = "changed by the caller"
+        self.assertNotIn("name", inst.to_dict())
+        self.assertIs(inst.to_json_string(), inst.to_json_string())
+        for change in (lambda: setattr(inst, "name", "Betty"),
+                       lambda: inst.tags.append("b")):
+            change()
+            self.assertEqual(json.loads(inst.to_json_string()),
+                             inst.to_dict())
+        self.assertEqual(inst.to_dict()["name"], "Betty")
+        self.assertEqual(inst.to_dict()["tags"], ["a", "b"])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_compact_models(self):
+        """Test the attribute API of models under HBNB_COMPACT_MODELS=1"""
+        script = """if True:
+            from models.place import Place
+            place = Place(name="Home", created_at="2017-09-28T21:03:54")
+            place.color = "blue"
+            assert Place.__dictoffset__ == 0
+            assert place.max_guest == 0 and place.amenity_ids == []
+            assert place.__dict__["color"] == "blue"
+            clone = Place(**place.to_dict())
+            assert clone.to_dict() == place.to_dict(), clone.to_dict()
+            try:
+                place.missing
+            except AttributeError:
+                pass
+            else:
+                raise AssertionError("missing attribute")
+        """
+        env = dict(os.environ, HBNB_COMPACT_MODELS="1",
+                   HBNB_TYPE_STORAGE="file")
+        done = subprocess.run([sys.executable, "-c", script], env=env,
+                              stderr=subprocess.PIPE, universal_newlines=True)
+        self.assertEqual(done.returncode, 0, done.stderr)
+
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
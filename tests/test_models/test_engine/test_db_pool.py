@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+"""
+Contains the TestDbPoolDocs and TestTimedQueuePool classes
+"""
+
+import inspect
+from models.engine import db_pool
+import os
+import pep8
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError
+import tempfile
+import unittest
+TimedQueuePool = db_pool.TimedQueuePool
+
+
+class TestDbPoolDocs(unittest.TestCase):
+    """Tests to check the documentation and style of db_pool"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.pool_f = inspect.getmembers(TimedQueuePool, inspect.isfunction)
+
+    def test_pep8_conformance_db_pool(self):
+        """Test that models/engine/db_pool.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/db_pool.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_db_pool(self):
+        """Test tests/test_models/test_engine/test_db_pool.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_db_pool.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_db_pool_module_docstring(self):
+        """Test for the db_pool.py module docstring"""
+        self.assertIsNot(db_pool.__doc__, None,
+                         "db_pool.py needs a docstring")
+        self.assertTrue(len(db_pool.__doc__) >= 1,
+                        "db_pool.py needs a docstring")
+
+    def test_timed_queue_pool_class_docstring(self):
+        """Test for the TimedQueuePool class docstring"""
+        self.assertIsNot(TimedQueuePool.__doc__, None,
+                         "TimedQueuePool class needs a docstring")
+        self.assertTrue(len(TimedQueuePool.__doc__) >= 1,
+                        "TimedQueuePool class needs a docstring")
+
+    def test_pool_func_docstrings(self):
+        """Test for the presence of docstrings in TimedQueuePool methods"""
+        for func in self.pool_f:
+            if func[1].__module__ != db_pool.__name__:
+                continue
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestTimedQueuePool(unittest.TestCase):
+    """Test the TimedQueuePool class on a SQLite database"""
+
+    def setUp(self):
+        """Create an engine with a pool of one connection"""
+        self.tmp = tempfile.TemporaryDirectory()
+        url = "sqlite:///" + os.path.join(self.tmp.name, "hbnb.db")
+        self.engine = create_engine(url, poolclass=TimedQueuePool,
+                                    pool_size=1, max_overflow=0,
+                                    pool_timeout=0.05)
+
+    def tearDown(self):
+        """Dispose of the engine"""
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def test_stats(self):
+        """Test that checkouts, waits and timeouts are counted"""
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            stats = self.engine.pool.stats()
+            self.assertEqual(stats["checked_out"], 1)
+            self.assertEqual(stats["checkouts"], 1)
+            with self.assertRaises(TimeoutError):
+                self.engine.connect()
+        stats = self.engine.pool.stats()
+        self.assertEqual((stats["size"], stats["checked_out"],
+                          stats["checked_in"]), (1, 0, 1))
+        self.assertEqual((stats["checkouts"], stats["timeouts"]), (2, 1))
+        self.assertGreaterEqual(stats["max_wait"], 0.05)
+        self.assertGreaterEqual(stats["wait_time"], stats["max_wait"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,12 +17,29 @@ from models.user import User
 import json
 import os
 import pep8
+import subprocess
+import sys
+import tempfile
 import unittest
 DBStorage = db_storage.DBStorage
 classes = {"Amenity": Amenity, "City": City, "Place": Place,
            "Review": Review, "State": State, "User": User}
 
 
+def run_db_script(script, **env):
+    """Runs script in a new interpreter on DBStorage over a temporary
+    SQLite database, with the extra environment variables env"""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, HBNB_TYPE_STORAGE="db",
+                   HBNB_MYSQL_URL="sqlite:///" + os.path.join(tmp, "hbnb.db"),
+                   **env)
+        done = subprocess.run([sys.executable, "-c", script], env=env,
+                              stderr=subprocess.PIPE,
+                              universal_newlines=True)
+    if done.returncode != 0:
+        raise AssertionError(done.stderr)
+
+
 class TestDBStorageDocs(unittest.TestCase):
     """Tests to check the documentation and style of DBStorage class"""
     @classmethod
@@ -90,7 +107,7 @@ class TestFileStorage(unittest.TestCase):
         models.storage.new(state)
         models.storage.save()
         self.assertIn("State." + state.id, models.storage.all(State))
-                      
+
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
     def test_delete(self):
         """tests the delete function"""
@@ -101,35 +118,392 @@ class TestFileStorage(unittest.TestCase):
         models.storage.delete(state)
         models.storage.save()
         self.assertNotIn("State." + state.id, models.storage.all(State))
-               
+
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
     def test_reload(self):
-         """test that reloads  properly"""
-         state = State(name="California")
-         models.storage.new(state)
-         models.storage.save()
-         models.storage.close()
-         models.storage.reload()
-         self.assertIn("State." + state.id, models.storage.all(State))
-               
+        """test that reloads  properly"""
+        state = State(name="California")
+        models.storage.new(state)
+        models.storage.save()
+        models.storage.close()
+        models.storage.reload()
+        self.assertIn("State." + state.id, models.storage.all(State))
+
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
     def test_get(self):
         """test that get retrieves the correct object"""
         state = State(name="California")
         models.storage.new(state)
         models.storage.save()
-        retrieved_state = models.storage.get(State, state.id)
-        self.assertEqual(state, retrieved_state)
-               
+        self.assertIs(models.storage.get(State, state.id), state)
+        self.assertIs(models.storage.get("State", state.id), state)
+        self.assertIsNone(models.storage.get(State, "missing"))
+
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
     def test_count(self):
         """test if count returns the correct number of objects"""
         initial_count = models.storage.count()
+        initial_states = models.storage.count(State)
         state = State(name="California")
         models.storage.new(state)
         models.storage.save()
         self.assertEqual(models.storage.count(), initial_count + 1)
-        self.assertEqual(models.storage.count(state), 1)
+        self.assertEqual(models.storage.count(State), initial_states + 1)
+        self.assertEqual(models.storage.count("State"), initial_states + 1)
+        models.storage.delete(state)
+        self.assertEqual(models.storage.count(State), initial_states)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_find_and_range(self):
+        """test find and range backed by a database index"""
+        models.storage.create_index(State, "name", kind="sorted")
+        names = ["Aa_find_range", "Ab_find_range", "Ac_find_range"]
+        states = [State(name=name) for name in names]
+        for state in states:
+            models.storage.new(state)
+        models.storage.save()
+        self.assertEqual(models.storage.find(State, name=names[1]),
+                         [states[1]])
+        self.assertEqual(models.storage.range(State, "name",
+                                              names[1], names[2]),
+                         states[1:])
+        for state in states:
+            models.storage.delete(state)
+        models.storage.save()
+
+
+class TestDBStoragePool(unittest.TestCase):
+    """Test the connection pool options of DBStorage"""
+
+    def test_pool_options(self):
+        """Test that the HBNB_MYSQL_POOL_* variables configure the pool"""
+        script = """if True:
+            import models
+            from models.state import State
+            engine = models.storage._DBStorage__engine
+            assert engine.pool._pre_ping
+            assert engine.pool._recycle == 60
+            State(name="California").save()
+            pool = models.storage.metrics()["pool"]
+            assert pool["size"] == 2 and pool["timeout"] == 5, pool
+            assert pool["checkouts"] >= 1, pool
+        """
+        run_db_script(script, HBNB_MYSQL_POOL_SIZE="2",
+                      HBNB_MYSQL_MAX_OVERFLOW="1",
+                      HBNB_MYSQL_POOL_RECYCLE="60",
+                      HBNB_MYSQL_POOL_TIMEOUT="5",
+                      HBNB_MYSQL_POOL_PRE_PING="1")
+
+
+class TestDBStorageGroupCommit(unittest.TestCase):
+    """Test the group commits of DBStorage"""
+
+    def test_per_session(self):
+        """Test that the saves of each thread group in its own session"""
+        script = """if True:
+            import models
+            from models.state import State
+            from sqlalchemy import func, select
+            import threading
+            storage = models.storage
+            saved = threading.Event()
+            resume = threading.Event()
+
+            def other():
+                State(name="A1").save()
+                saved.set()
+                resume.wait()
+                State(name="A2").save()
+
+            thread = threading.Thread(target=other)
+            thread.start()
+            saved.wait()
+            State(name="M1").save()
+            State(name="M2").save()
+            resume.set()
+            thread.join()
+            with storage._DBStorage__engine.connect() as conn:
+                count = conn.scalar(select(func.count()).select_from(State))
+            assert count == 4, count
+            assert storage._group_state().pending == 0
+        """
+        run_db_script(script, HBNB_GROUP_COMMIT_OPS="2")
+
+
+class TestDBStorageCount(unittest.TestCase):
+    """Test the cached counts of DBStorage"""
+
+    def test_cached_count(self):
+        """Test that counts follow other workers and skip pending rows"""
+        script = """if True:
+            import models
+            from models.engine.db_storage import DBStorage
+            from models.state import State
+            from sqlalchemy import event
+            import threading
+            storage = models.storage
+            other = DBStorage()
+            other.reload()
+            statements = []
+            event.listen(storage._DBStorage__engine,
+                         "before_cursor_execute",
+                         lambda *args: statements.append(args[2]))
+            assert storage.count(State) == 0
+            assert storage.count(State) == 0
+            assert sum("count(" in sql for sql in statements) == 1
+            del statements[:]
+            names = ["Amenity", "City", "Place", "Review", "State", "User"]
+            counts = storage.count_many(names + ["Nothing"])
+            assert counts == dict.fromkeys(names + ["Nothing"], 0), counts
+            assert len(statements) == 1, statements
+            other.new(State(name="A"))
+            other.save()
+            assert storage.count(State) == 1
+            storage.new(State(name="B"))
+            assert storage.count(State) == 2
+            seen = []
+            thread = threading.Thread(
+                target=lambda: seen.append(storage.count(State)))
+            thread.start()
+            thread.join()
+            assert seen == [1], seen
+            storage.rollback()
+            assert storage.count(State) == 1
+        """
+        run_db_script(script)
+
+
+class TestDBStorageLoad(unittest.TestCase):
+    """Test the eager loading options of DBStorage"""
+
+    def test_constant_queries(self):
+        """Test that the cities by states page runs a fixed query count"""
+        script = """if True:
+            import importlib.util
+            import models
+            from models.city import City
+            from models.state import State
+            from sqlalchemy import event
+            import sys
+            spec = importlib.util.spec_from_file_location(
+                "page", "web_flask/8-cities_by_states.py")
+            page = importlib.util.module_from_spec(spec)
+            sys.modules[spec.name] = page
+            spec.loader.exec_module(page)
+            client = page.app.test_client()
+            queries = []
+            event.listen(models.storage._DBStorage__engine,
+                         "before_cursor_execute",
+                         lambda *args: queries.append(args[2]))
+            counts = []
+            for i in range(3):
+                for j in range(2):
+                    state = State(name="S{}{}".format(i, j))
+                    state.save()
+                    City(name="C", state_id=state.id).save()
+                models.storage.close()
+                del queries[:]
+                response = client.get("/cities_by_states")
+                assert response.status_code == 200
+                assert response.data.count(b"<LI>") == 4 * (i + 1)
+                counts.append(len(queries))
+            assert counts[0] == counts[-1] <= 3, counts
+            models.storage.close()
+            states = models.storage.all(State, load={"cities": "joined"})
+            del queries[:]
+            assert all(len(s.cities) == 1 for s in states.values())
+            assert not queries, queries
+            try:
+                models.storage.all(State, load=["towns"])
+            except ValueError:
+                pass
+            else:
+                raise AssertionError("unknown relationship")
+        """
+        run_db_script(script)
+
+
+class TestDBStorageBulk(unittest.TestCase):
+    """Test bulk_new and bulk_upsert of DBStorage"""
+
+    def test_bulk(self):
+        """Test that bulk writes batch their statements"""
+        script = """if True:
+            import models
+            from models.state import State
+            from sqlalchemy import event
+            storage = models.storage
+            statements = []
+            event.listen(storage._DBStorage__engine,
+                         "before_cursor_execute",
+                         lambda *args: "hbnb_generations" in args[2] or
+                         statements.append(args[2].split()[0]))
+            storage.bulk_new([State(name=str(i)) for i in range(50)])
+            assert statements.count("INSERT") == 1, statements
+            assert storage.count(State) == 50
+            state = storage.all(State).popitem()[1]
+            del statements[:]
+            rows = [{"name": "T{}".format(i)} for i in range(100)]
+            rows.append({"id": state.id, "name": "Updated"})
+            storage.bulk_upsert("State", rows)
+            assert statements.count("INSERT") == 1, statements
+            assert statements.count("UPDATE") == 1, statements
+            storage.close()
+            assert storage.count(State) == 150
+            assert storage.get(State, state.id).name == "Updated"
+            storage.bulk_upsert(State, [{"id": "x", "name": "Utah",
+                                         "created_at": "2017-03-25T02:17:06",
+                                         "unknown": 1}])
+            storage.close()
+            utah = storage.get(State, "x")
+            assert utah.created_at.year == 2017, utah.created_at
+            try:
+                storage.bulk_upsert(State, [
+                    {"name": "good"},
+                    {"name": "bad",
+                     "created_at": "2020-01-01T00:00:00+00:00"}])
+            except ValueError:
+                pass
+            else:
+                raise AssertionError("time with an offset")
+            storage.close()
+            assert storage.count(State) == 151, storage.count(State)
+        """
+        run_db_script(script)
+
+
+class TestDBStorageIter(unittest.TestCase):
+    """Test iter of DBStorage"""
+
+    def test_iter(self):
+        """Test that iter yields every object, filtered by where"""
+        script = """if True:
+            import models
+            from models.city import City
+            from models.state import State
+            storage = models.storage
+            states = [State(name=str(i)) for i in range(20)]
+            storage.bulk_new(states)
+            City(name="Reno", state_id=states[0].id).save()
+            storage.close()
+            names = [state.name for state in storage.iter(State, 7)]
+            assert sorted(names) == sorted(str(i) for i in range(20))
+            assert len(list(storage.iter())) == 21
+            assert len(list(storage.iter("City"))) == 1
+            found = list(storage.iter(State, where={"name": "3"}))
+            assert [state.id for state in found] == [states[3].id], found
+            assert list(storage.iter(State, where={"name": "x"})) == []
+        """
+        run_db_script(script)
+
+
+class TestDBStoragePage(unittest.TestCase):
+    """Test page of DBStorage"""
+
+    def test_page(self):
+        """Test that pages walk (created_at, id) order, ties included"""
+        script = """if True:
+            import models
+            from models.state import State
+            storage = models.storage
+            storage.bulk_new([State(name=str(i)) for i in range(60)])
+            storage.bulk_upsert(State, [
+                {"name": "Tie", "created_at": "2017-03-25T02:17:06"}
+                for i in range(30)])
+            storage.close()
+            order = sorted(storage.all(State).values(),
+                           key=lambda state: (state.created_at, state.id))
+            seen = []
+            after = None
+            while True:
+                page = storage.page(State, after=after, limit=40)
+                if not page:
+                    break
+                seen.extend(page)
+                after = (page[-1].created_at, page[-1].id)
+            assert seen == order
+            page = storage.page("State", limit=5, where={"name": "7"})
+            assert [found.name for found in page] == ["7"], page
+            ties = storage.page(State, limit=100, where={"name": "Tie"})
+            assert ties == order[:30]
+        """
+        run_db_script(script)
+
+
+class TestDBStorageVersion(unittest.TestCase):
+    """Test version() of DBStorage"""
+
+    def test_version(self):
+        """Test versions and write hooks on committed writes"""
+        script = """if True:
+            import models
+            from models.city import City
+            from models.state import State
+            storage = models.storage
+            empty = storage.version(State)
+            assert empty == (0, None), empty
+            state = State(name="California")
+            state.save()
+            version = storage.version(State)
+            assert version[0] == 1 and version[1] is not None, version
+            cities = storage.version(City)
+            state.name = "Nevada"
+            state.save()
+            assert storage.version("State")[0] == 2
+            storage.delete(state)
+            storage.save()
+            assert storage.version(State)[0] == 3
+            assert storage.version(City) == cities
+            storage.save()
+            assert storage.version(State)[0] == 3
+            calls = []
+            storage.on_write(calls.append)
+            state = State(name="Utah")
+            storage.new(state)
+            assert storage.count(State) == 1
+            assert calls == [], calls
+            storage.save()
+            state.name = "Ohio"
+            storage.save()
+            storage.bulk_upsert(City, [{"name": "Reno", "state_id": state.id}])
+            storage.delete(state)
+            storage.rollback()
+            storage.save()
+            assert calls == [{"State"}, {"State"}, {"City"}], calls
+        """
+        run_db_script(script)
+
+
+class TestDBStorageGetMany(unittest.TestCase):
+    """Test get_many of DBStorage"""
+
+    def test_get_many(self):
+        """Test that get_many reads the objects with one IN per 500 IDs"""
+        script = """if True:
+            import models
+            from models.state import State
+            from sqlalchemy import event
+            storage = models.storage
+            states = [State(name=str(i)) for i in range(600)]
+            storage.bulk_new(states)
+            storage.close()
+            statements = []
+            event.listen(storage._DBStorage__engine,
+                         "before_cursor_execute",
+                         lambda *args: statements.append(args[2]))
+            ids = [states[2].id, "missing", states[0].id, states[2].id]
+            found = storage.get_many("State", ids, load=["cities"])
+            assert [state.id for state in found] == ids[::2][:2], found
+            assert sum(" IN " in sql for sql in statements) == 2, statements
+            assert storage.get_many("Nothing", ids) == []
+            del statements[:]
+            ids = [state.id for state in reversed(states)]
+            found = storage.get_many(State, ids)
+            assert [state.id for state in found] == ids
+            assert sum(" IN " in sql for sql in statements) == 2, statements
+        """
+        run_db_script(script)
+
 
-if __name__ = '__main__':
+if __name__ == '__main__':
     unittest.main()
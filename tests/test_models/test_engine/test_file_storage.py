@@ -7,6 +7,8 @@ from datetime import datetime
 import inspect
 import models
 from models.engine import file_storage
+from models.engine.indexes import HashIndex
+from models.engine.write_hooks import WriteHooks
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -17,12 +19,25 @@ from models.user import User
 import json
 import os
 import pep8
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
 import unittest
+from unittest import mock
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
 
+def empty_index(index):
+    """Returns an empty index of the kind of index"""
+    if isinstance(index, HashIndex):
+        return HashIndex(index.attr, index.order)
+    return type(index)(index.attr)
+
+
 class TestFileStorageDocs(unittest.TestCase):
     """Tests to check the documentation and style of FileStorage class"""
     @classmethod
@@ -95,6 +110,8 @@ class TestFileStorage(unittest.TestCase):
         FileStorage._FileStorage__objects = save
 
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    @unittest.skipIf(FileStorage._FileStorage__format != "json",
+                     "file.json is not JSON")
     def test_save(self):
         """Test that save properly saves objects to file.json"""
         storage = FileStorage()
@@ -113,27 +130,952 @@ class TestFileStorage(unittest.TestCase):
         with open("file.json", "r") as f:
             js = f.read()
         self.assertEqual(json.loads(string), json.loads(js))
-               
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_cls(self):
+        """Test that all(cls) only holds objects of that class"""
+        storage = FileStorage()
+        state = State()
+        city = City()
+        storage.new(state)
+        storage.new(city)
+        states = storage.all(State)
+        self.assertIs(states["State." + state.id], state)
+        self.assertNotIn("City." + city.id, states)
+        self.assertEqual(dict(states), dict(storage.all("State")))
+        for obj in states.values():
+            self.assertIs(type(obj), State)
+        with self.assertRaises(TypeError):
+            states["State.fake"] = state
+        storage.delete(state)
+        self.assertNotIn("State." + state.id, storage.all(State))
+        self.assertNotIn("State." + state.id, storage.all())
+        storage.delete(city)
+
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_get(self):
         """Test that get retrieves the correct object"""
         storage = FileStorage()
-        state = State(name"California")
+        state = State(name="California")
         storage.new(state)
-        storage.save()
-        retrieved_state = storage.get(State, state.id)
-        self.assertEqual(state, retrieved_state)
-               
-     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
-     def test_count(self):
-         """test that count"""
-         storage = FileStorage()
-         initial_count = storage.count()
-         state = State(name="California")
-         storage.new(state)
-         storage.save()
-         self.assertEqual(storage.count(), initial_count + 1)
-         self.asssertEqual(storage.count(State), 1)
+        self.assertIs(storage.get(State, state.id), state)
+        self.assertIs(storage.get("State", state.id), state)
+        self.assertIsNone(storage.get(City, state.id))
+        self.assertIsNone(storage.get(State, "missing"))
+        self.assertIsNone(storage.get(State, None))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_count(self):
+        """Test that count returns the number of objects in storage"""
+        storage = FileStorage()
+        initial_count = storage.count()
+        initial_states = storage.count(State)
+        state = State(name="California")
+        storage.new(state)
+        self.assertEqual(storage.count(), initial_count + 1)
+        self.assertEqual(storage.count(State), initial_states + 1)
+        self.assertEqual(storage.count("State"), initial_states + 1)
+        self.assertEqual(storage.count_many([State, "City", "Nothing"]),
+                         {"State": initial_states + 1,
+                          "City": storage.count(City), "Nothing": 0})
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TempFileStorageCase(unittest.TestCase):
+    """Base for tests running FileStorage on an empty temporary store"""
+    attrs = ["objects", "by_class", "pending", "lazy", "mmap", "indexes",
+             "file_path", "journal", "dirty", "journal_size",
+             "compact_every", "fsync", "checksum", "format", "signature",
+             "shared", "generation", "journal_pos", "fsync_interval",
+             "last_fsync", "sync_timer", "versions", "written", "batch",
+             "reloads", "reloads_skipped", "catch_ups"]
+
+    def setUp(self):
+        """Point FileStorage to an empty store in a temporary directory"""
+        self.saved = {a: getattr(FileStorage, "_FileStorage__" + a)
+                      for a in self.attrs}
+        self.saved_hooks = WriteHooks._write_hooks
+        WriteHooks._write_hooks = list(self.saved_hooks)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "file.json")
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__by_class = {}
+        FileStorage._FileStorage__pending = {}
+        FileStorage._FileStorage__lazy = True
+        FileStorage._FileStorage__mmap = False
+        FileStorage._FileStorage__indexes = {
+            "City": {"state_id": HashIndex("state_id", "created_at")},
+            "Place": {"city_id": HashIndex("city_id", "created_at")},
+            "Review": {"place_id": HashIndex("place_id", "created_at")}}
+        FileStorage._FileStorage__file_path = self.path
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__dirty = {}
+        FileStorage._FileStorage__journal_size = 0
+        FileStorage._FileStorage__compact_every = 1000
+        FileStorage._FileStorage__fsync = "never"
+        FileStorage._FileStorage__checksum = False
+        FileStorage._FileStorage__format = "json"
+        FileStorage._FileStorage__signature = None
+        FileStorage._FileStorage__shared = False
+        FileStorage._FileStorage__generation = 0
+        FileStorage._FileStorage__journal_pos = (None, 0)
+        FileStorage._FileStorage__versions = {}
+        FileStorage._FileStorage__written = set()
+        FileStorage._FileStorage__batch = 0
+        FileStorage._FileStorage__reloads = 0
+        FileStorage._FileStorage__reloads_skipped = 0
+        FileStorage._FileStorage__catch_ups = 0
+        self.storage = FileStorage()
+
+    def tearDown(self):
+        """Restore the FileStorage class attributes and the write hooks"""
+        for a, value in self.saved.items():
+            setattr(FileStorage, "_FileStorage__" + a, value)
+        WriteHooks._write_hooks = self.saved_hooks
+        self.tmp.cleanup()
+
+    def reloaded(self):
+        """Returns the objects found by reloading into an empty registry"""
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__by_class = {}
+        FileStorage._FileStorage__pending = {}
+        FileStorage._FileStorage__indexes = {
+            name: {attr: empty_index(index) for attr, index in indexes.items()}
+            for name, indexes in FileStorage._FileStorage__indexes.items()}
+        self.storage.reload()
+        return self.storage.all()
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageJournal(TempFileStorageCase):
+    """Test the append-only journal mode of FileStorage"""
+
+    def setUp(self):
+        """Switch FileStorage to journal mode"""
+        super().setUp()
+        FileStorage._FileStorage__journal = True
+
+    def test_save_appends_changed_objects_only(self):
+        """Test that save appends one record per changed object"""
+        state = State(name="California")
+        city = City(name="Fresno")
+        self.storage.new(state)
+        self.storage.new(city)
+        self.storage.save()
+        state.name = "Nevada"
+        self.storage.save()
+        self.storage.save()
+        with open(self.path + ".journal") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[2], ["State." + state.id, state.to_dict()])
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_reload_replays_journal(self):
+        """Test that reload applies snapshot then journal records"""
+        state = State(name="California")
+        city = City(name="Fresno")
+        self.storage.new(state)
+        self.storage.new(city)
+        self.storage.compact()
+        state.name = "Nevada"
+        self.storage.delete(city)
+        self.storage.save()
+        objects = self.reloaded()
+        self.assertEqual(list(objects), ["State." + state.id])
+        self.assertEqual(objects["State." + state.id].name, "Nevada")
+        self.assertIsNot(objects["State." + state.id], state)
+
+    def test_reload_ignores_torn_record(self):
+        """Test that a partially written last record is skipped"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        with open(self.path + ".journal", "a") as f:
+            f.write('["State.x", {"__cla')
+        self.assertEqual(list(self.reloaded()), ["State." + state.id])
+
+    def test_write_after_torn_record(self):
+        """Test that records saved after a torn one are not lost"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        with open(self.path + ".journal", "a") as f:
+            f.write('["State.x", {"__cla')
+        self.reloaded()
+        states = [State(name="Nevada"), State(name="Utah")]
+        for new in states:
+            new.save()
+        self.assertCountEqual(self.reloaded(), ["State." + obj.id
+                                                for obj in [state] + states])
+        self.storage.compact()
+        self.assertEqual(len(self.reloaded()), 3)
+
+    def test_compact(self):
+        """Test that compact folds the journal into the snapshot"""
+        states = [State(name=str(i)) for i in range(3)]
+        for state in states:
+            self.storage.new(state)
+        self.storage.save()
+        self.storage.compact()
+        self.assertFalse(os.path.exists(self.path + ".journal"))
+        self.assertFalse(os.path.exists(self.path + ".journal.old"))
+        with open(self.path) as f:
+            self.assertEqual(len(json.load(f)), 3)
+        self.assertEqual(len(self.reloaded()), 3)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageFsync(TempFileStorageCase):
+    """Test the fsync policies of FileStorage"""
+
+    def setUp(self):
+        """Use the batched policy, a sync having just happened"""
+        super().setUp()
+        FileStorage._FileStorage__fsync = "batched"
+        FileStorage._FileStorage__fsync_interval = 0.05
+        FileStorage._FileStorage__last_fsync = time.monotonic()
+        FileStorage._FileStorage__sync_timer = None
+
+    def test_replace_always_synced(self):
+        """Test that a snapshot is synced before replacing the file"""
+        self.storage.new(State(name="California"))
+        with mock.patch.object(file_storage.os, "fsync") as fsync:
+            self.storage.save()
+        # the temporary file, then the directory of the rename
+        self.assertEqual(fsync.call_count, 2)
+
+    def test_never(self):
+        """Test that nothing is synced under the never policy"""
+        FileStorage._FileStorage__fsync = "never"
+        self.storage.new(State(name="California"))
+        with mock.patch.object(file_storage.os, "fsync") as fsync:
+            self.storage.save()
+        self.assertEqual(fsync.call_count, 0)
+
+    def test_batched_journal(self):
+        """Test that journal appends are synced later, together"""
+        FileStorage._FileStorage__journal = True
+        with mock.patch.object(file_storage.os, "fsync") as fsync:
+            for name in ("California", "Nevada"):
+                self.storage.new(State(name=name))
+                self.storage.save()
+            self.assertEqual(fsync.call_count, 0)
+            time.sleep(0.2)
+            self.assertEqual(fsync.call_count, 1)
+        self.assertIsNone(FileStorage._FileStorage__sync_timer)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageSnapshot(TempFileStorageCase):
+    """Test how FileStorage writes and validates file.json"""
+
+    def test_save_replaces_file(self):
+        """Test that save leaves only the complete snapshot behind"""
+        self.storage.new(State(name="California"))
+        FileStorage._FileStorage__fsync = "always"
+        self.storage.save()
+        self.assertEqual(os.listdir(self.tmp.name), ["file.json"])
+        self.assertEqual(len(self.reloaded()), 1)
+
+    def test_checksum_footer(self):
+        """Test that the checksum footer is written and checked"""
+        FileStorage._FileStorage__checksum = True
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        with open(self.path) as f:
+            data = f.read()
+        self.assertRegex(data, r"\n#crc32:[0-9a-f]{8}\n$")
+        self.assertIn("State." + state.id, self.reloaded())
+        with open(self.path, "w") as f:
+            f.write(data.replace("California", "Californib"))
+        with self.assertRaises(ValueError):
+            self.reloaded()
+
+    def test_reload_truncated_file(self):
+        """Test that a truncated snapshot is reported, not ignored"""
+        with open(self.path, "w") as f:
+            f.write('{"State.1": {"__cla')
+        with self.assertRaises(ValueError):
+            self.reloaded()
+
+    def test_close_skips_unchanged_file(self):
+        """Test that close only reloads after another writer's change"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        metrics = self.storage.metrics()
+        self.storage.close()
+        self.storage.close()
+        self.assertIs(self.storage.get(State, state.id), state)
+        self.assertEqual(self.storage.metrics(), {
+            "reloads": metrics["reloads"],
+            "reloads_skipped": metrics["reloads_skipped"] + 2,
+            "catch_ups": metrics["catch_ups"]})
+        other = State(name="Nevada")
+        with open(self.path, "w") as f:
+            json.dump({"State." + other.id: other.to_dict()}, f)
+        self.storage.close()
+        self.assertEqual(self.storage.get(State, other.id).name, "Nevada")
+        self.assertEqual(self.storage.metrics()["reloads"],
+                         metrics["reloads"] + 1)
+
+    def test_transaction(self):
+        """Test that a transaction writes the snapshot once, at its end"""
+        with models.storage.transaction():
+            for i in range(3):
+                State(name=str(i)).save()
+            self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(len(self.reloaded()), 3)
+
+    def test_reload_missing_file(self):
+        """Test that a missing snapshot means an empty store"""
+        self.assertEqual(self.reloaded(), {})
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageCodecs(TempFileStorageCase):
+    """Test the snapshot codecs of FileStorage"""
+
+    def test_round_trip(self):
+        """Test that every codec saves and reloads the same records"""
+        state = State(name="Calé")
+        place = Place(name="Home", amenity_ids=["1"], latitude=1.5)
+        for obj in (state, place):
+            self.storage.new(obj)
+        for codec in ("json", "jsonl", "pickle", "marshal"):
+            for checksum in (False, True):
+                with self.subTest(codec=codec, checksum=checksum):
+                    FileStorage._FileStorage__format = codec
+                    FileStorage._FileStorage__checksum = checksum
+                    self.storage.save()
+                    objects = self.reloaded()
+                    self.assertEqual(objects["State." + state.id].to_dict(),
+                                     state.to_dict())
+                    self.assertEqual(objects["Place." + place.id].to_dict(),
+                                     place.to_dict())
+                    for obj in objects.values():
+                        self.storage.new(obj)
+
+    def test_detect(self):
+        """Test that reload reads a snapshot written with another codec"""
+        self.storage.new(State(name="California"))
+        FileStorage._FileStorage__format = "marshal"
+        self.storage.save()
+        FileStorage._FileStorage__format = "jsonl"
+        self.assertEqual(len(self.reloaded()), 1)
+
+    def test_corrupt(self):
+        """Test that damaged binary snapshots are reported"""
+        for obj in [State(name=str(i)) for i in range(3)]:
+            self.storage.new(obj)
+        for codec in ("pickle", "marshal"):
+            with self.subTest(codec=codec):
+                FileStorage._FileStorage__format = codec
+                self.storage.save()
+                with open(self.path, "rb") as f:
+                    data = f.read()
+                with open(self.path, "wb") as f:
+                    f.write(data[:-20])
+                with self.assertRaises(ValueError):
+                    self.reloaded()
+
+    def test_pickle_globals(self):
+        """Test that a pickle snapshot cannot import anything"""
+        with open(self.path, "wb") as f:
+            f.write(b"#hbnb-pickle-5\n")
+            pickle.dump([("State.1", {"x": os.getcwd})], f)
+        with self.assertRaises(ValueError):
+            self.reloaded()
+
+    def test_unknown_format(self):
+        """Test that an unknown HBNB_FILE_FORMAT is an error"""
+        FileStorage._FileStorage__format = "yaml"
+        with self.assertRaises(ValueError):
+            self.storage.save()
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageMmap(TempFileStorageCase):
+    """Test the memory-mapped record mode of FileStorage"""
+
+    def setUp(self):
+        """Save a jsonl snapshot and reload it in mmap mode"""
+        super().setUp()
+        FileStorage._FileStorage__mmap = True
+        FileStorage._FileStorage__format = "jsonl"
+        self.places = [Place(name=str(i), max_guest=i) for i in range(3)]
+        for place in self.places:
+            self.storage.new(place)
+        self.storage.save()
+        with open(self.path, "rb") as f:
+            self.data = f.read()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__by_class = {}
+        self.storage.reload()
+
+    def test_records_stay_mapped(self):
+        """Test that reload only indexes records and get decodes one"""
+        pending = FileStorage._FileStorage__pending["Place"]
+        self.assertEqual(len(pending), 3)
+        for record in pending.values():
+            self.assertIsInstance(record, file_storage.MappedRecord)
+        place = self.storage.get(Place, self.places[1].id)
+        self.assertEqual(place.to_dict(), self.places[1].to_dict())
+        self.assertEqual(len(pending), 2)
+        self.assertEqual(self.storage.count(Place), 3)
+
+    def test_save_copies_mapped_records(self):
+        """Test that saving writes the mapped records back unchanged"""
+        self.storage.save()
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertEqual(len(self.storage.all(Place)), 3)
+
+    def test_unmappable_lines(self):
+        """Test that lines in another layout are decoded at reload"""
+        with open(self.path, "w") as f:
+            f.write('["Place.a\\"b",{"__class__":"Place","id":"a\\"b"}]\n')
+            f.write('\n["Place.c",{"__class__":"Place","id":"c"}]\n')
+        objects = self.reloaded()
+        self.assertEqual(sorted(objects), ['Place.a"b', "Place.c"])
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageIndexes(TempFileStorageCase):
+    """Test the relationship indexes of FileStorage"""
+
+    def test_state_cities(self):
+        """Test that State.cities follows new, update and delete"""
+        california = State(name="California")
+        nevada = State(name="Nevada")
+        fresno = City(name="Fresno", state_id=california.id)
+        reno = City(name="Reno", state_id=california.id)
+        for obj in (california, nevada, fresno, reno):
+            models.storage.new(obj)
+        self.assertEqual(california.cities, [fresno, reno])
+        self.assertEqual(nevada.cities, [])
+        reno.state_id = nevada.id
+        self.assertEqual(california.cities, [fresno])
+        self.assertEqual(nevada.cities, [reno])
+        models.storage.delete(fresno)
+        self.assertEqual(california.cities, [])
+
+    def test_page(self):
+        """Test that page walks (created_at, id) order, filtered by where"""
+        state = State(name="California")
+        same = datetime(2017, 3, 25, 2, 17, 6).isoformat()
+        cities = [City(name=str(i % 2), state_id=state.id if i < 4 else "",
+                       created_at=same if i < 3 else None) for i in range(6)]
+        for city in cities:
+            self.storage.new(city)
+        order = sorted(cities, key=lambda city: (city.created_at, city.id))
+        after = (order[1].created_at, order[1].id)
+        self.assertEqual(self.storage.page(City, limit=2), order[:2])
+        self.assertEqual(self.storage.page(City, after=after, limit=3),
+                         order[2:5])
+        self.assertEqual(self.storage.page(City, after=after, limit=9,
+                                           where={"name": "0"}),
+                         [city for city in order[2:] if city.name == "0"])
+        by_state = [city for city in order if city.state_id == state.id]
+        self.assertEqual(self.storage.page(City, limit=9,
+                                           where={"state_id": state.id}),
+                         by_state)
+        self.assertEqual(self.storage.page(City, after=after, limit=1,
+                                           where={"state_id": state.id,
+                                                  "name": "1"}),
+                         [city for city in by_state[2:]
+                          if city.name == "1"][:1])
+
+    def test_page_bucket(self):
+        """Test that a hash index bucket is paged in (created_at, id) order"""
+        places = [Place(name=str(i), city_id="c" if i % 3 else "d")
+                  for i in range(9)]
+        for place in places:
+            self.storage.new(place)
+        places[1].created_at = datetime(2017, 3, 25, 2, 17, 6)
+        in_c = sorted((place for place in places if place.city_id == "c"),
+                      key=lambda place: (place.created_at, place.id))
+        self.assertIs(in_c[0], places[1])
+        index = FileStorage._FileStorage__indexes["Place"]["city_id"]
+        self.assertEqual([key for created_at, key in index.ordered["c"]],
+                         ["Place." + place.id for place in in_c])
+        seen = []
+        after = None
+        while True:
+            page = self.storage.page(Place, after=after, limit=2,
+                                     where={"city_id": "c"})
+            if not page:
+                break
+            seen.extend(page)
+            after = (page[-1].created_at, page[-1].id)
+        self.assertEqual(seen, in_c)
+        places[1].city_id = "d"
+        self.assertNotIn("Place." + places[1].id,
+                         [key for created_at, key in index.ordered["c"]])
+        self.storage.delete(places[2])
+        self.assertEqual(self.storage.page(Place, limit=9,
+                                           where={"city_id": "c"}),
+                         [place for place in in_c[1:]
+                          if place is not places[2]])
+
+    def test_cities_after_reload(self):
+        """Test that the indexes are rebuilt by reload"""
+        california = State(name="California")
+        fresno = City(name="Fresno", state_id=california.id)
+        models.storage.new(california)
+        models.storage.new(fresno)
+        models.storage.save()
+        models.storage.reload()
+        cities = california.cities
+        self.assertEqual(len(cities), 1)
+        self.assertEqual(cities[0].id, fresno.id)
+        self.assertIsNot(cities[0], fresno)
+
+    def test_place_reviews(self):
+        """Test that Place.reviews only returns reviews of the place"""
+        place = Place(name="Home")
+        other = Place(name="Away")
+        review = Review(place_id=place.id, text="Nice")
+        models.storage.new(review)
+        models.storage.new(Review(place_id=other.id, text="Meh"))
+        self.assertEqual(place.reviews, [review])
+
+    def test_place_amenities(self):
+        """Test that Place.amenities resolves amenity_ids"""
+        wifi = Amenity(name="Wifi")
+        models.storage.new(wifi)
+        place = Place(name="Home", amenity_ids=[wifi.id, "missing"])
+        self.assertEqual(place.amenities, [wifi])
+
+    def test_find(self):
+        """Test find with and without an index"""
+        california = State(name="California")
+        fresno = City(name="Fresno", state_id=california.id)
+        models.storage.new(fresno)
+        models.storage.new(City(name="Reno", state_id=california.id))
+        self.assertEqual(models.storage.find(City, state_id=california.id,
+                                             name="Fresno"), [fresno])
+        self.assertEqual(models.storage.find("City", name="Fresno"),
+                         [fresno])
+        self.assertEqual(models.storage.find(City, name="Paris"), [])
+
+    def test_create_index(self):
+        """Test find and range on indexes created at runtime"""
+        places = [Place(name=str(p), price_by_night=p)
+                  for p in (200, 50, 100, 100)]
+        for place in places[:2]:
+            models.storage.new(place)
+        for kind in ("hash", "sorted"):
+            models.storage.create_index(Place, "price_by_night", kind)
+            self.assertIsInstance(FileStorage._FileStorage__indexes[
+                "Place"]["price_by_night"], HashIndex if kind == "hash"
+                else file_storage.SortedIndex)
+        for place in places[2:]:
+            models.storage.new(place)
+        self.assertCountEqual(models.storage.find(Place, price_by_night=100),
+                              places[2:])
+        places[0].price_by_night = 75
+        found = models.storage.range(Place, "price_by_night", 60, 100)
+        self.assertEqual(found[0], places[0])
+        self.assertCountEqual(found[1:], places[2:])
+        models.storage.delete(places[3])
+        self.assertEqual(models.storage.range("Place", "price_by_night"),
+                         [places[1], places[0], places[2]])
+        with self.assertRaises(ValueError):
+            models.storage.create_index(Place, "name", "btree")
+
+    def test_range_without_index(self):
+        """Test that range works on attributes that are not indexed"""
+        for guests in (3, 1, 2):
+            models.storage.new(Place(max_guest=guests))
+        found = models.storage.range(Place, "max_guest", lo=2)
+        self.assertEqual([place.max_guest for place in found], [2, 3])
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageLazy(TempFileStorageCase):
+    """Test that reload only builds objects when they are accessed"""
+
+    def setUp(self):
+        """Save a State and two Cities, then reload them"""
+        super().setUp()
+        self.state = State(name="California")
+        self.cities = [City(name=name, state_id=self.state.id)
+                       for name in ("Fresno", "Reno")]
+        for obj in [self.state] + self.cities:
+            self.storage.new(obj)
+        self.storage.save()
+        self.reloaded_pending()
+
+    def reloaded_pending(self):
+        """Reloads into an empty registry without touching any object"""
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__by_class = {}
+        FileStorage._FileStorage__pending = {}
+        FileStorage._FileStorage__indexes = {
+            name: {attr: empty_index(index) for attr, index in indexes.items()}
+            for name, indexes in FileStorage._FileStorage__indexes.items()}
+        self.storage.reload()
+
+    def test_bad_record_loses_nothing(self):
+        """Test that a record failing to build keeps the others on disk"""
+        states = [State(name=str(i)) for i in range(4)]
+        records = {"State." + state.id: state.to_dict() for state in states}
+        records["State." + states[1].id]["created_at"] = "garbage"
+        with open(self.path, "w") as f:
+            json.dump(records, f)
+        self.reloaded_pending()
+        with self.assertRaises(ValueError):
+            self.storage.all(State)
+        self.assertEqual(self.storage.count(State), 4)
+        self.storage.new(City(name="Fresno"))
+        self.storage.save()
+        with open(self.path) as f:
+            saved = json.load(f)
+        self.assertEqual(len(saved), 5)
+        self.assertEqual(saved["State." + states[1].id]["created_at"],
+                         "garbage")
+
+    def test_reload_is_lazy(self):
+        """Test that reload keeps records and count does not build them"""
+        self.assertEqual(FileStorage._FileStorage__objects, {})
+        self.assertEqual(self.storage.count(), 3)
+        self.assertEqual(self.storage.count(City), 2)
+        self.assertEqual(FileStorage._FileStorage__objects, {})
+
+    def test_get_builds_one_object(self):
+        """Test that get only builds the object it returns"""
+        city = self.storage.get(City, self.cities[0].id)
+        self.assertEqual(city.name, "Fresno")
+        self.assertIs(self.storage.get(City, city.id), city)
+        self.assertEqual(list(FileStorage._FileStorage__objects),
+                         ["City." + city.id])
+        self.assertEqual(self.storage.count(), 3)
+
+    def test_all_cls_builds_one_class(self):
+        """Test that all(cls) and the indexes build one class only"""
+        state = self.storage.get(State, self.state.id)
+        self.assertEqual(sorted(city.name for city in state.cities),
+                         ["Fresno", "Reno"])
+        self.assertEqual(len(self.storage.all(City)), 2)
+        self.assertEqual(len(FileStorage._FileStorage__objects), 3)
+        self.assertEqual(FileStorage._FileStorage__pending, {})
+
+    def test_load_related(self):
+        """Test that load builds the classes of the relationships"""
+        states = self.storage.all(State, load=["cities"])
+        self.assertEqual(len(states), 1)
+        self.assertEqual(FileStorage._FileStorage__pending, {})
+        self.assertEqual(len(FileStorage._FileStorage__objects), 3)
+        with self.assertRaises(ValueError):
+            self.storage.all(State, load=["cities.owner"])
+
+    def test_get_load_related(self):
+        """Test that get with load builds the related classes too"""
+        self.reloaded_pending()
+        state = self.storage.get(State, self.state.id, load=["cities"])
+        self.assertEqual(len(state.cities), 2)
+        self.assertEqual(FileStorage._FileStorage__pending, {})
+        self.assertIsNone(self.storage.get(State, "missing", load=["x"]))
+
+    def test_iter(self):
+        """Test that iter yields objects without keeping pending ones"""
+        city = self.storage.get(City, self.cities[0].id)
+        self.storage.delete(self.storage.get(State, self.state.id))
+        cities = list(self.storage.iter(City, batch_size=1))
+        self.assertIs(cities[0], city)
+        self.assertEqual(sorted(city.name for city in cities),
+                         ["Fresno", "Reno"])
+        self.assertEqual(list(FileStorage._FileStorage__objects),
+                         ["City." + city.id])
+        self.assertEqual(len(list(self.storage.iter())), 2)
+        self.assertEqual(list(self.storage.iter(State)), [])
+
+    def test_get_many(self):
+        """Test that get_many only builds the records asked for"""
+        ids = [self.cities[1].id, "missing", self.state.id,
+               self.cities[0].id, self.cities[1].id]
+        cities = self.storage.get_many(City, ids)
+        self.assertEqual([city.id for city in cities],
+                         [self.cities[1].id, self.cities[0].id])
+        self.assertEqual(list(FileStorage._FileStorage__pending),
+                         ["State"])
+        self.assertEqual(self.storage.get_many("City", ids), cities)
+        self.assertEqual(self.storage.get_many("Nothing", ids), [])
+        states = self.storage.get_many(State, [self.state.id],
+                                       load=["cities"])
+        self.assertEqual(len(states[0].cities), 2)
+        self.assertEqual(FileStorage._FileStorage__pending, {})
+
+    def test_iter_where(self):
+        """Test that iter filters live objects and pending records"""
+        live = self.storage.get(City, self.cities[0].id)
+        where = {"state_id": self.state.id}
+        self.assertEqual(len(list(self.storage.iter(City, where=where))), 2)
+        found = list(self.storage.iter(City, where={"name": "Fresno"}))
+        self.assertEqual(found, [live])
+        found = list(self.storage.iter(City, where={"name": "Reno"}))
+        self.assertEqual([city.id for city in found], [self.cities[1].id])
+        self.assertEqual(len(FileStorage._FileStorage__objects), 1)
+        self.storage.create_index(City, "name")
+        found = list(self.storage.iter(City, where={"name": "Reno"}))
+        self.assertEqual([city.id for city in found], [self.cities[1].id])
+        self.assertEqual(list(self.storage.iter(City, where={"name": "x"})),
+                         [])
+
+    def test_save_and_delete_pending(self):
+        """Test that pending records are saved and can be deleted"""
+        self.storage.delete(self.cities[1])
+        self.storage.new(State(name="Nevada"))
+        self.storage.save()
+        with open(self.path) as f:
+            saved = json.load(f)
+        self.assertEqual(len(saved), 3)
+        self.assertEqual(saved["City." + self.cities[0].id],
+                         self.cities[0].to_dict())
+        self.assertEqual(len(self.reloaded()), 3)
+
+    def test_eager(self):
+        """Test that HBNB_FILE_LAZY=0 builds every object in reload"""
+        FileStorage._FileStorage__lazy = False
+        self.reloaded_pending()
+        self.assertEqual(len(FileStorage._FileStorage__objects), 3)
+        self.assertEqual(FileStorage._FileStorage__pending, {})
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageBulk(TempFileStorageCase):
+    """Test bulk_new and bulk_upsert"""
+
+    def test_bulk_new(self):
+        """Test that bulk_new saves every object with one journal write"""
+        FileStorage._FileStorage__journal = True
+        states = [State(name=str(i)) for i in range(3)]
+        self.storage.bulk_new(states)
+        with open(self.path + ".journal") as f:
+            self.assertEqual(len(f.readlines()), 3)
+        self.assertEqual(FileStorage._FileStorage__dirty, {})
+        self.assertCountEqual(self.reloaded(),
+                              ["State." + state.id for state in states])
+
+    def test_bulk_upsert(self):
+        """Test that bulk_upsert updates objects and records, inserts rest"""
+        live = State(name="California")
+        pending = State(name="Nevada")
+        self.storage.bulk_new([live, pending])
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__by_class = {}
+        self.storage.reload()
+        live = self.storage.get(State, live.id)
+        self.storage.bulk_upsert(State, [
+            {"id": live.id, "name": "Oregon"},
+            {"id": pending.id, "name": "Utah", "__class__": "City"},
+            {"id": "new", "name": "Texas"}, {"name": "Ohio"}])
+        self.assertEqual(live.name, "Oregon")
+        self.assertEqual(self.storage.count(State), 4)
+        objects = self.reloaded()
+        self.assertEqual(objects["State." + live.id].name, "Oregon")
+        self.assertEqual(objects["State." + pending.id].name, "Utah")
+        self.assertEqual(objects["State." + pending.id].created_at,
+                         pending.created_at)
+        self.assertGreater(objects["State." + pending.id].updated_at,
+                           pending.updated_at)
+        self.assertEqual(objects["State.new"].name, "Texas")
+        self.assertEqual(sorted(state.name for state in objects.values()),
+                         ["Ohio", "Oregon", "Texas", "Utah"])
+
+    def test_bulk_upsert_user(self):
+        """Test that bulk_upsert hashes the passwords of users"""
+        self.storage.bulk_upsert("User", [{"id": "u", "password": "pwd"}])
+        self.assertEqual(self.storage.get(User, "u").password,
+                         "9003d1df22eb4d3820015070385194c8")
+        with self.assertRaises(ValueError):
+            self.storage.bulk_upsert("Nothing", [{}])
+
+    def test_bulk_upsert_bad_time(self):
+        """Test that rows with an unreadable time are rejected up front"""
+        self.storage.bulk_upsert(State, [{"id": "s", "name": "Utah"}])
+        for stamp in ("2020-01-01T00:00:00+00:00", "garbage", 12):
+            with self.subTest(stamp=stamp):
+                with self.assertRaises(ValueError):
+                    self.storage.bulk_upsert(State, [
+                        {"name": "good"},
+                        {"id": "s", "name": "bad", "created_at": stamp}])
+                self.assertEqual(
+                    [state.name for state in self.storage.all(State).values()],
+                    ["Utah"])
+        self.storage.bulk_upsert(State, [
+            {"name": "Ohio", "created_at": datetime(2017, 3, 25, 2, 17, 6)}])
+        self.assertEqual(self.storage.count(State), 2)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageVersion(TempFileStorageCase):
+    """Test the per-class versions of version()"""
+
+    def assertChanged(self, cls, before, changed=True):
+        """Asserts whether the version of cls changed since before"""
+        after = self.storage.version(cls)
+        if changed:
+            self.assertNotEqual(after[0], before[0])
+            self.assertGreaterEqual(after[1], before[1] or after[1])
+        else:
+            self.assertEqual(after, before)
+        return after
+
+    def test_writes(self):
+        """Test that every kind of write changes the version of its class"""
+        version = self.storage.version(State)
+        amenities = self.storage.version("Amenity")
+        state = State(name="California")
+        self.assertChanged(State, version, False)
+        self.storage.new(state)
+        version = self.assertChanged(State, version)
+        self.assertIsInstance(version[1], datetime)
+        state.name = "Nevada"
+        version = self.assertChanged(State, version)
+        self.storage.bulk_upsert(State, [{"name": "Utah"}])
+        version = self.assertChanged(State, version)
+        self.storage.delete(state)
+        version = self.assertChanged(State, version)
+        state.name = "Oregon"
+        version = self.assertChanged(State, version, False)
+        self.storage.reload()
+        self.assertChanged(State, version)
+        self.assertNotEqual(self.storage.version(Amenity), amenities)
+
+    def test_other_classes(self):
+        """Test that writes leave the versions of other classes alone"""
+        version = self.storage.version(City)
+        self.storage.new(State(name="California"))
+        self.storage.save()
+        self.assertChanged(City, version, False)
+
+    def test_write_hooks(self):
+        """Test that the write hooks run once per write or bulk write"""
+        calls = []
+        hook = self.storage.on_write(calls.append)
+        self.addCleanup(FileStorage._write_hooks.remove, hook)
+        state = State(name="California")
+        self.storage.new(state)
+        self.assertEqual(calls, [{"State"}])
+        self.storage.bulk_new([City(name=str(i)) for i in range(3)])
+        self.storage.bulk_upsert(State, [{"name": "Utah"}, {"name": "Ohio"}])
+        self.assertEqual(calls[1:], [{"City"}, {"State"}])
+        del calls[:]
+        self.storage.reload()
+        self.assertEqual(calls, [set(file_storage.classes)])
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+@unittest.skipIf(file_storage.fcntl is None, "no fcntl locks")
+class TestFileStorageShared(TempFileStorageCase):
+    """Test the multi-process mode of FileStorage"""
+
+    def setUp(self):
+        """Switch FileStorage to the shared mode"""
+        super().setUp()
+        FileStorage._FileStorage__shared = True
+        FileStorage._FileStorage__journal = True
+
+    def append(self, *records):
+        """Appends records to the journal as another process would"""
+        with open(self.path + ".journal", "a") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+
+    def test_journal_header(self):
+        """Test that the journal starts with its generation"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        with open(self.path + ".journal") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records, [["#generation", 0],
+                                   ["State." + state.id, state.to_dict()]])
+        self.assertEqual(FileStorage._FileStorage__journal_pos[1],
+                         os.path.getsize(self.path + ".journal"))
+
+    def test_close_catches_up(self):
+        """Test that close only applies the records of other processes"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        metrics = self.storage.metrics()
+        self.storage.close()
+        other = State(name="Nevada")
+        self.append(["State." + other.id, other.to_dict()],
+                    ["State." + state.id])
+        self.storage.close()
+        self.assertEqual(self.storage.get(State, other.id).name, "Nevada")
+        self.assertIsNone(self.storage.get(State, state.id))
+        self.assertEqual(self.storage.metrics(), {
+            "reloads": metrics["reloads"],
+            "reloads_skipped": metrics["reloads_skipped"] + 1,
+            "catch_ups": metrics["catch_ups"] + 1})
+
+    def test_save_keeps_unsaved_changes(self):
+        """Test that catching up before a save does not undo changes"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        state.name = "Nevada"
+        record = state.to_dict()
+        record["name"] = "Oregon"
+        self.append(["State." + state.id, record])
+        self.storage.save()
+        self.assertIs(self.storage.get(State, state.id), state)
+        self.assertEqual(self.reloaded()["State." + state.id].name, "Nevada")
+
+    def test_new_generation_reloads(self):
+        """Test that a compaction elsewhere makes close reload"""
+        states = [State(name=str(i)) for i in range(2)]
+        for state in states:
+            self.storage.new(state)
+        self.storage.save()
+        with open(self.path, "w") as f:
+            json.dump({"State." + states[0].id: states[0].to_dict()}, f)
+        with open(self.path + ".journal", "w") as f:
+            f.write('["#generation", 1]\n')
+        reloads = self.storage.metrics()["reloads"]
+        self.storage.close()
+        self.assertEqual(self.storage.metrics()["reloads"], reloads + 1)
+        self.assertEqual(list(self.storage.all()), ["State." + states[0].id])
+        self.assertEqual(FileStorage._FileStorage__generation, 1)
+
+    def test_compact(self):
+        """Test that compact starts a new generation of the journal"""
+        self.storage.new(State(name="California"))
+        self.storage.save()
+        self.storage.compact()
+        with open(self.path + ".journal") as f:
+            self.assertEqual(f.read(), '["#generation", 1]\n')
+        self.assertEqual(len(self.reloaded()), 1)
+
+    def test_processes(self):
+        """Test that concurrent processes lose no save"""
+        script = """if True:
+            import models
+            from models.state import State
+            for i in range(100):
+                State(name=str(i)).save()
+        """
+        env = dict(os.environ, HBNB_TYPE_STORAGE="file",
+                   HBNB_FILE_SHARED="1", HBNB_FILE_COMPACT="40",
+                   HBNB_FILE_FSYNC="never",
+                   PYTHONPATH=os.path.abspath(os.curdir))
+        workers = [subprocess.Popen([sys.executable, "-c", script], env=env,
+                                    cwd=self.tmp.name,
+                                    stderr=subprocess.PIPE,
+                                    universal_newlines=True)
+                   for i in range(3)]
+        for worker in workers:
+            self.assertEqual(worker.wait(), 0, worker.stderr.read())
+            worker.stderr.close()
+        self.assertEqual(len(self.reloaded()), 300)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/python3
+"""
+Contains the TestGroupCommitDocs and TestGroupCommit classes
+"""
+
+import inspect
+from models.engine import group_commit
+import pep8
+import time
+import unittest
+GroupCommit = group_commit.GroupCommit
+
+
+class Counter(GroupCommit):
+    """GroupCommit engine that only counts its flushes and rollbacks"""
+    flushes = 0
+    rollbacks = 0
+
+    def flush(self):
+        """counts a flush"""
+        self.flushes += 1
+
+    def rollback(self):
+        """counts a rollback"""
+        self.rollbacks += 1
+
+
+class TestGroupCommitDocs(unittest.TestCase):
+    """Tests to check the documentation and style of GroupCommit class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.gc_f = inspect.getmembers(GroupCommit, inspect.isfunction)
+
+    def test_pep8_conformance_group_commit(self):
+        """Test that models/engine/group_commit.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/group_commit.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_group_commit(self):
+        """Test tests/test_models/test_engine/test_group_commit.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_group_commit.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_group_commit_module_docstring(self):
+        """Test for the group_commit.py module docstring"""
+        self.assertIsNot(group_commit.__doc__, None,
+                         "group_commit.py needs a docstring")
+        self.assertTrue(len(group_commit.__doc__) >= 1,
+                        "group_commit.py needs a docstring")
+
+    def test_group_commit_class_docstring(self):
+        """Test for the GroupCommit class docstring"""
+        self.assertIsNot(GroupCommit.__doc__, None,
+                         "GroupCommit class needs a docstring")
+        self.assertTrue(len(GroupCommit.__doc__) >= 1,
+                        "GroupCommit class needs a docstring")
+
+    def test_gc_func_docstrings(self):
+        """Test for the presence of docstrings in GroupCommit methods"""
+        for func in self.gc_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestGroupCommit(unittest.TestCase):
+    """Test the GroupCommit class"""
+    def test_flush_abstract(self):
+        """Test that engines must define flush"""
+        self.assertRaises(TypeError, GroupCommit)
+
+    def test_save_flushes_by_default(self):
+        """Test that save flushes right away when grouping is off"""
+        engine = Counter()
+        engine.save()
+        engine.save()
+        self.assertEqual(engine.flushes, 2)
+
+    def test_group_ops(self):
+        """Test that every group_ops saves are flushed together"""
+        engine = Counter()
+        engine.group_ops = 3
+        for i in range(7):
+            engine.save()
+        self.assertEqual(engine.flushes, 2)
+        engine.flush_pending()
+        self.assertEqual(engine.flushes, 3)
+        engine.flush_pending()
+        self.assertEqual(engine.flushes, 3)
+
+    def test_group_window(self):
+        """Test that the window timer flushes the pending saves"""
+        engine = Counter()
+        engine.group_window = 0.05
+        for i in range(5):
+            engine.save()
+        self.assertEqual(engine.flushes, 0)
+        time.sleep(0.2)
+        self.assertEqual(engine.flushes, 1)
+
+    def test_group_window_without_timer(self):
+        """Test that an expired window is flushed by the next save"""
+        engine = Counter()
+        engine.group_window = 0.05
+        engine.group_timer = False
+        engine.save()
+        time.sleep(0.1)
+        self.assertEqual(engine.flushes, 0)
+        engine.save()
+        self.assertEqual(engine.flushes, 1)
+
+    def test_transaction(self):
+        """Test that a transaction flushes once when it exits"""
+        engine = Counter()
+        with engine.transaction():
+            for i in range(5):
+                engine.save()
+            with engine.transaction():
+                engine.save()
+            self.assertEqual(engine.flushes, 0)
+        self.assertEqual(engine.flushes, 1)
+        with engine.transaction():
+            pass
+        self.assertEqual(engine.flushes, 2)
+
+    def test_transaction_error(self):
+        """Test that a failing transaction rolls back instead of flushing"""
+        engine = Counter()
+        with self.assertRaises(KeyError):
+            with engine.transaction():
+                engine.save()
+                raise KeyError
+        self.assertEqual((engine.flushes, engine.rollbacks), (0, 1))
+        engine.flush_pending()
+        self.assertEqual(engine.flushes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
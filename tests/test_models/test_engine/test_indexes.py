@@ -0,0 +1,214 @@
+#!/usr/bin/python3
+"""
+Contains the TestIndexesDocs, TestHashIndex and TestSortedIndex classes
+"""
+
+import inspect
+from models.engine import indexes
+import pep8
+import unittest
+HashIndex = indexes.HashIndex
+SortedIndex = indexes.SortedIndex
+
+
+class Row:
+    """Minimal object to index"""
+
+    def __init__(self, **kwargs):
+        """Sets kwargs as attributes"""
+        self.__dict__.update(kwargs)
+
+
+class TestIndexesDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the indexes module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.hi_f = inspect.getmembers(HashIndex, inspect.isfunction)
+        cls.si_f = inspect.getmembers(SortedIndex, inspect.isfunction)
+
+    def test_pep8_conformance_indexes(self):
+        """Test that models/engine/indexes.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/indexes.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_indexes(self):
+        """Test tests/test_models/test_engine/test_indexes.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_indexes.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_indexes_module_docstring(self):
+        """Test for the indexes.py module docstring"""
+        self.assertIsNot(indexes.__doc__, None,
+                         "indexes.py needs a docstring")
+        self.assertTrue(len(indexes.__doc__) >= 1,
+                        "indexes.py needs a docstring")
+
+    def test_hash_index_class_docstring(self):
+        """Test for the HashIndex class docstring"""
+        self.assertIsNot(HashIndex.__doc__, None,
+                         "HashIndex class needs a docstring")
+        self.assertTrue(len(HashIndex.__doc__) >= 1,
+                        "HashIndex class needs a docstring")
+
+    def test_sorted_index_class_docstring(self):
+        """Test for the SortedIndex class docstring"""
+        self.assertIsNot(SortedIndex.__doc__, None,
+                         "SortedIndex class needs a docstring")
+        self.assertTrue(len(SortedIndex.__doc__) >= 1,
+                        "SortedIndex class needs a docstring")
+
+    def test_si_func_docstrings(self):
+        """Test for the presence of docstrings in SortedIndex methods"""
+        for func in self.si_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+    def test_hi_func_docstrings(self):
+        """Test for the presence of docstrings in HashIndex methods"""
+        for func in self.hi_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestHashIndex(unittest.TestCase):
+    """Test the HashIndex class"""
+    def test_add_find_remove(self):
+        """Test that objects are found under their current value"""
+        index = HashIndex("state_id")
+        a = Row(state_id="1")
+        b = Row(state_id="1")
+        index.add("City.a", a)
+        index.add("City.b", b)
+        self.assertEqual(index.find("1"), [a, b])
+        self.assertEqual(index.find("2"), [])
+        index.remove("City.a")
+        index.remove("City.a")
+        self.assertEqual(index.find("1"), [b])
+        index.remove("City.b")
+        self.assertEqual(index.buckets, {})
+
+    def test_add_moves_changed_value(self):
+        """Test that re-adding an object moves it to its new value"""
+        index = HashIndex("state_id")
+        a = Row(state_id="1")
+        index.add("City.a", a)
+        a.state_id = "2"
+        index.add("City.a", a)
+        self.assertEqual(index.find("1"), [])
+        self.assertEqual(index.find("2"), [a])
+
+    def test_ordered_buckets(self):
+        """Test that buckets stay sorted on the order attribute and key"""
+        index = HashIndex("state_id", "created_at")
+        rows = {name: Row(state_id="1", created_at=at)
+                for name, at in (("a", 3), ("b", 1), ("c", 2), ("d", 1))}
+        for name, row in rows.items():
+            index.add("City." + name, row)
+        self.assertEqual(index.ordered["1"], [(1, "City.b"), (1, "City.d"),
+                                              (2, "City.c"), (3, "City.a")])
+        rows["a"].created_at = 0
+        index.add("City.a", rows["a"])
+        rows["c"].state_id = "2"
+        index.add("City.c", rows["c"])
+        index.remove("City.d")
+        self.assertEqual(index.ordered, {"1": [(0, "City.a"), (1, "City.b")],
+                                         "2": [(2, "City.c")]})
+        rows["c"].created_at = "late"
+        index.add("City.c", rows["c"])
+        index.add("City.e", Row(state_id="2", created_at=None))
+        self.assertEqual(index.ordered["2"], [("late", "City.c")])
+        self.assertEqual(len(index.find("2")), 2)
+
+    def test_missing_attribute(self):
+        """Test that objects without the attribute are indexed as None"""
+        index = HashIndex("state_id")
+        a = Row()
+        index.add("City.a", a)
+        self.assertEqual(index.find(None), [a])
+
+    def test_unhashable_value(self):
+        """Test that objects with an unhashable value are left out"""
+        index = HashIndex("amenity_ids")
+        a = Row(amenity_ids=["1"])
+        index.add("Place.a", a)
+        self.assertEqual(index.values, {})
+
+
+class TestSortedIndex(unittest.TestCase):
+    """Test the SortedIndex class"""
+    def setUp(self):
+        """Index a few rows by price"""
+        self.index = SortedIndex("price")
+        self.rows = {}
+        for name, price in (("a", 50), ("b", 100), ("c", 100), ("d", 200),
+                            ("e", None)):
+            self.rows[name] = Row(price=price)
+            self.index.add("Place." + name, self.rows[name])
+
+    def prices(self, objs):
+        """Returns the prices of objs"""
+        return [obj.price for obj in objs]
+
+    def test_range(self):
+        """Test that range is inclusive and ordered"""
+        self.assertEqual(self.prices(self.index.range(60, 100)), [100, 100])
+        self.assertEqual(self.prices(self.index.range(100, 200)),
+                         [100, 100, 200])
+        self.assertEqual(self.prices(self.index.range(hi=99)), [50])
+        self.assertEqual(self.prices(self.index.range()),
+                         [50, 100, 100, 200])
+        self.assertEqual(self.index.range(300), [])
+
+    def test_find(self):
+        """Test equality lookups, None included"""
+        self.assertEqual(self.index.find(100),
+                         [self.rows["b"], self.rows["c"]])
+        self.assertEqual(self.index.find(None), [self.rows["e"]])
+        self.assertEqual(self.index.find(70), [])
+
+    def test_update_and_remove(self):
+        """Test that changed values move and removed keys disappear"""
+        self.rows["a"].price = 300
+        self.index.add("Place.a", self.rows["a"])
+        self.rows["e"].price = 10
+        self.index.add("Place.e", self.rows["e"])
+        self.index.remove("Place.d")
+        self.index.remove("Place.d")
+        self.assertEqual(self.prices(self.index.range()),
+                         [10, 100, 100, 300])
+        self.assertEqual(self.index.find(None), [])
+
+    def test_incomparable_value(self):
+        """Test that values of another type are kept out of the order"""
+        f = Row(price="free")
+        self.index.add("Place.f", f)
+        self.assertEqual(self.index.unordered, {"Place.f": f})
+        self.assertEqual(self.prices(self.index.range()),
+                         [50, 100, 100, 200])
+        self.assertEqual(self.index.find("free"), [f])
+        self.assertEqual(self.index.find("paid"), [])
+        with self.assertRaises(TypeError):
+            self.index.range("a", "z")
+        f.price = 75
+        self.index.add("Place.f", f)
+        self.assertEqual(self.index.unordered, {})
+        self.assertEqual(self.index.find(75), [f])
+        f.price = "free"
+        self.index.add("Place.f", f)
+        self.index.remove("Place.f")
+        self.assertEqual(self.index.find("free"), [])
+        self.assertEqual(len(self.index.entries), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
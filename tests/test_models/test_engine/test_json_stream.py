@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+"""
+Contains the TestJsonStreamDocs and TestObjectReader classes
+"""
+
+import inspect
+import io
+import json
+from models.engine import json_stream
+import pep8
+import unittest
+ObjectReader = json_stream.ObjectReader
+
+
+class TestJsonStreamDocs(unittest.TestCase):
+    """Tests to check the documentation and style of json_stream"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.or_f = inspect.getmembers(ObjectReader, inspect.isfunction)
+
+    def test_pep8_conformance_json_stream(self):
+        """Test that models/engine/json_stream.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/json_stream.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_json_stream(self):
+        """Test tests/test_models/test_engine/test_json_stream.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_json_stream.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_json_stream_module_docstring(self):
+        """Test for the json_stream.py module docstring"""
+        self.assertIsNot(json_stream.__doc__, None,
+                         "json_stream.py needs a docstring")
+        self.assertTrue(len(json_stream.__doc__) >= 1,
+                        "json_stream.py needs a docstring")
+
+    def test_object_reader_class_docstring(self):
+        """Test for the ObjectReader class docstring"""
+        self.assertIsNot(ObjectReader.__doc__, None,
+                         "ObjectReader class needs a docstring")
+        self.assertTrue(len(ObjectReader.__doc__) >= 1,
+                        "ObjectReader class needs a docstring")
+
+    def test_or_func_docstrings(self):
+        """Test for the presence of docstrings in ObjectReader methods"""
+        for func in self.or_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestObjectReader(unittest.TestCase):
+    """Test the ObjectReader class"""
+
+    def read(self, text, chunk_size=3):
+        """Returns the reader and the members it read from text"""
+        reader = ObjectReader(io.StringIO(text), chunk_size)
+        return reader, list(reader)
+
+    def test_members(self):
+        """Test that members come out in order, across chunk borders"""
+        data = {"State.1": {"name": "Calé", "n": [1, 2.5, None]},
+                "Place.2": {"price": 12345, "ok": True}, "x": 7}
+        text = json.dumps(data)
+        for size in (1, 2, 3, 7, 1 << 16):
+            with self.subTest(size=size):
+                reader, members = self.read(text, size)
+                self.assertEqual(members, list(data.items()))
+                self.assertEqual(reader.tail, "")
+
+    def test_tail(self):
+        """Test that tail holds what follows the object"""
+        text = '\n { "a" : {"b": 1} , "c":2}'
+        reader, members = self.read(text + "\n#footer\n")
+        self.assertEqual(members, [("a", {"b": 1}), ("c", 2)])
+        self.assertEqual(reader.tail, "\n#footer\n")
+
+    def test_empty_object(self):
+        """Test that an empty object has no members"""
+        reader, members = self.read(" {} ")
+        self.assertEqual(members, [])
+        self.assertEqual(reader.tail, " ")
+
+    def test_invalid(self):
+        """Test that truncated or malformed documents raise ValueError"""
+        for text in ("", "[]", '{"a": {"b"', '{"a": 1 "b": 2}', '{"a" 1}'):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    self.read(text)
+
+
+if __name__ == '__main__':
+    unittest.main()
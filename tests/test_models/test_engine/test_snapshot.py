@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+"""
+Contains the TestSnapshotDocs and TestCodecs classes
+"""
+
+import inspect
+import io
+from models.engine import snapshot
+import pep8
+import unittest
+import zlib
+
+
+class TestSnapshotDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the snapshot module"""
+
+    def test_pep8_conformance_snapshot(self):
+        """Test that models/engine/snapshot.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/snapshot.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_snapshot(self):
+        """Test tests/test_models/test_engine/test_snapshot.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_snapshot.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_snapshot_module_docstring(self):
+        """Test for the snapshot.py module docstring"""
+        self.assertIsNot(snapshot.__doc__, None,
+                         "snapshot.py needs a docstring")
+        self.assertTrue(len(snapshot.__doc__) >= 1,
+                        "snapshot.py needs a docstring")
+
+    def test_codec_docstrings(self):
+        """Test for the docstrings of the codec classes and methods"""
+        for cls in [snapshot.ChecksumWriter, snapshot.MappedRecord] + [
+                type(codec) for codec in snapshot.CODECS.values()]:
+            self.assertTrue(cls.__doc__, "{} needs a docstring".format(cls))
+            for name, func in inspect.getmembers(cls, inspect.isfunction):
+                self.assertTrue(func.__doc__,
+                                "{:s} method needs a docstring".format(name))
+
+
+class TestCodecs(unittest.TestCase):
+    """Test the snapshot codecs"""
+    records = [("State.1", {"name": "Calé", "__class__": "State"}),
+               ("Place.2", {"amenity_ids": ["a"], "latitude": 1.5,
+                            "max_guest": 4, "description": None})]
+
+    def test_dump_load(self):
+        """Test that each codec reads back what it wrote, then the rest"""
+        for name, codec in snapshot.CODECS.items():
+            with self.subTest(codec=name):
+                f = io.BytesIO()
+                codec.dump(iter(self.records), f)
+                f.write(b"\n#rest\n")
+                f.seek(0)
+                loaded = []
+                gen = codec.load(f)
+                try:
+                    while True:
+                        loaded.append(next(gen))
+                except StopIteration as stop:
+                    rest = stop.value
+                self.assertEqual([tuple(pair) for pair in loaded],
+                                 self.records)
+                self.assertEqual(rest.strip(), b"#rest")
+
+    def test_detect(self):
+        """Test that detect recognizes what each codec writes"""
+        for name, codec in snapshot.CODECS.items():
+            with self.subTest(codec=name):
+                f = io.BytesIO()
+                codec.dump(iter(self.records), f)
+                self.assertIs(snapshot.detect(f.getvalue()[:64], None),
+                              codec)
+        self.assertIsNone(snapshot.detect(b"", None))
+
+    def test_index(self):
+        """Test that jsonl index maps records without decoding them"""
+        f = io.BytesIO()
+        snapshot.CODECS["jsonl"].dump(iter(self.records), f)
+        f.write(b"#rest\n")
+        gen = snapshot.CODECS["jsonl"].index(f.getvalue())
+        pairs = []
+        try:
+            while True:
+                pairs.append(next(gen))
+        except StopIteration as stop:
+            self.assertEqual(stop.value, b"#rest\n")
+        self.assertEqual([key for key, record in pairs],
+                         [key for key, record in self.records])
+        for (key, mapped), (_, record) in zip(pairs, self.records):
+            self.assertIsInstance(mapped, snapshot.MappedRecord)
+            self.assertEqual(mapped.load(), record)
+            self.assertEqual(snapshot.to_record(mapped), record)
+            self.assertEqual(snapshot.to_json(mapped), mapped.text())
+
+    def test_checksum_writer(self):
+        """Test that ChecksumWriter forwards data and keeps its crc32"""
+        f = io.BytesIO()
+        writer = snapshot.ChecksumWriter(f)
+        writer.write(b"abc")
+        writer.write(b"def")
+        self.assertEqual(f.getvalue(), b"abcdef")
+        self.assertEqual(writer.crc, zlib.crc32(b"abcdef"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""
+Contains the TestWriteHooksDocs and TestWriteHooks classes
+"""
+
+import inspect
+from models.engine import write_hooks
+import pep8
+import unittest
+WriteHooks = write_hooks.WriteHooks
+
+
+class TestWriteHooksDocs(unittest.TestCase):
+    """Tests to check the documentation and style of write_hooks"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.hooks_f = inspect.getmembers(WriteHooks, inspect.isfunction)
+
+    def test_pep8_conformance_write_hooks(self):
+        """Test that models/engine/write_hooks.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/write_hooks.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_write_hooks(self):
+        """Test tests/test_models/test_engine/test_write_hooks.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_write_hooks.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_write_hooks_module_docstring(self):
+        """Test for the write_hooks.py module docstring"""
+        self.assertIsNot(write_hooks.__doc__, None,
+                         "write_hooks.py needs a docstring")
+        self.assertTrue(len(write_hooks.__doc__) >= 1,
+                        "write_hooks.py needs a docstring")
+
+    def test_write_hooks_class_docstring(self):
+        """Test for the WriteHooks class docstring"""
+        self.assertIsNot(WriteHooks.__doc__, None,
+                         "WriteHooks class needs a docstring")
+        self.assertTrue(len(WriteHooks.__doc__) >= 1,
+                        "WriteHooks class needs a docstring")
+
+    def test_hooks_func_docstrings(self):
+        """Test for the presence of docstrings in WriteHooks methods"""
+        for func in self.hooks_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestWriteHooks(unittest.TestCase):
+    """Test the registration and calls of the write hooks"""
+
+    def test_written(self):
+        """Test that hooks get the names written, and nothing empty"""
+        class Engine(WriteHooks):
+            """an engine with hooks of its own"""
+            _write_hooks = []
+        engine = Engine()
+        calls = []
+        hook = calls.append
+        self.assertIs(engine.on_write(hook), hook)
+        engine._written({"State"})
+        engine._written(set())
+        engine._written(None)
+        self.assertEqual(calls, [{"State"}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -170,6 +170,8 @@ class TestPlace(unittest.TestCase):
         self.assertTrue(hasattr(place, "amenity_ids"))
         self.assertEqual(type(place.amenity_ids), list)
         self.assertEqual(len(place.amenity_ids), 0)
+        place.amenity_ids.append("1")
+        self.assertEqual(Place().amenity_ids, [])
 
     def test_to_dict_creates_dict(self):
         """test to_dict method creates a dictionary with proper attrs"""